@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+measure time and memory allocation per SystemStatus.update on synthetic /proc and /sys trees.
+every collector is made due on each update, so the numbers are the cost of the heaviest tick.
+
+Usage:
+  bench_update.py [--updates <n>] [--save <file>] [--compare <file>] [--tolerance <p>] [<case>...]
+  bench_update.py --list
+
+Options:
+  -n --updates <n>   updates per case [default: 50].
+  --save <file>      save results as JSON.
+  --compare <file>   compare with saved results. exit with 1 if a case is slower or allocates more than tolerance.
+  --tolerance <p>    allowed regression in percent [default: 20].
+  --list             list cases.
+"""
+from __future__ import absolute_import, print_function
+
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import tracemalloc
+
+from docopt import docopt
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from ttop import core
+from fixture import Fixture
+
+#=======================================
+# Config
+#=======================================
+
+# name: (cpus, pids, interfaces, devices)
+CASES = (
+    ("1cpu", (1, 100, 1, 1)),
+    ("64cpus", (64, 10000, 64, 256)),
+    ("1024cpus", (1024, 10000, 16, 64)),
+    ("100k-pids", (8, 100000, 2, 8)),
+    ("4k-devices", (8, 1000, 2048, 2048)),
+)
+
+#=======================================
+# Functions
+#=======================================
+
+
+def create_system_status():
+    ss = core.SystemStatus()
+    ss.enable_stats(60)
+    ss.enable_interrupts()
+    ss.enable_paging()
+    ss.enable_tcp()
+    return ss
+
+
+def update(ss):
+    for collector in ss.collectors.collectors:
+        collector.timestamp = None
+    ss.update()
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(int(len(values) * q), len(values) - 1)]
+
+
+def run_case(name, params, updates):
+    root = tempfile.mkdtemp(prefix="ttop-bench-")
+    try:
+        fixture = Fixture(root, *params)
+        fixture.write()
+        core.set_root(root)
+        ss = create_system_status()
+
+        times = []
+        for i in range(updates):
+            fixture.tick()
+            start = time.perf_counter()
+            update(ss)
+            times.append(time.perf_counter() - start)
+
+        # allocation is measured separately, tracemalloc slows down everything.
+        peaks = []
+        tracemalloc.start()
+        for i in range(max(updates // 5, 1)):
+            fixture.tick()
+            tracemalloc.reset_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            update(ss)
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+        tracemalloc.stop()
+
+        return {"mean": sum(times) / len(times), "p95": percentile(times, 0.95), "peak": sum(peaks) / len(peaks)}
+    finally:
+        core.set_root("/")
+        shutil.rmtree(root)
+
+
+def compare(results, baseline, tolerance):
+    """print ratio to baseline. return names of cases regressed beyond tolerance."""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+
+        ratios = dict((key, result[key] / baseline[name][key] if baseline[name][key] else 1.0) for key in ("mean", "peak"))
+        regressed = [key for key, ratio in ratios.items() if ratio > 1 + tolerance / 100.0]
+        print("%-12s time x%.2f, allocation x%.2f%s" % (name, ratios["mean"], ratios["peak"], "  REGRESSION" if regressed else ""))
+        if regressed:
+            regressions.append(name)
+
+    return regressions
+
+
+def main():
+    args = docopt(__doc__)
+    cases = dict(CASES)
+
+    if args["--list"]:
+        for name, (cpus, pids, interfaces, devices) in CASES:
+            print("%-12s cpus %d, pids %d, interfaces %d, devices %d" % (name, cpus, pids, interfaces, devices))
+        return
+
+    names = args["<case>"] or [name for name, params in CASES]
+    for name in names:
+        if name not in cases:
+            sys.exit("unknown case: " + name)
+
+    results = {}
+    print("%-12s %10s %10s %12s" % ("case", "mean ms", "p95 ms", "alloc KiB"))
+    for name in names:
+        result = run_case(name, cases[name], int(args["--updates"]))
+        results[name] = result
+        print("%-12s %10.3f %10.3f %12.1f" % (name, result["mean"] * 1000, result["p95"] * 1000, result["peak"] / 1024))
+
+    if args["--save"]:
+        with open(args["--save"], "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args["--compare"]:
+        with open(args["--compare"]) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, float(args["--tolerance"])):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+write a synthetic /proc and /sys tree for ttop samplers.
+ttop reads it when TTOP_ROOT is set to the directory, or after ttop.core.set_root(directory).
+
+Usage:
+  fixture.py <directory> [--cpus <n>] [--pids <n>] [--interfaces <n>] [--devices <n>] [--seed <n>]
+
+Options:
+  --cpus <n>        number of CPUs [default: 4].
+  --pids <n>        number of processes [default: 100].
+  --interfaces <n>  number of network interfaces [default: 2].
+  --devices <n>     number of block devices [default: 8].
+  --seed <n>        seed of counters [default: 0].
+"""
+from __future__ import absolute_import
+
+import os
+import random
+
+from docopt import docopt
+
+#=======================================
+# Fixture
+#=======================================
+
+SOFTIRQS = ("HI", "TIMER", "NET_TX", "NET_RX", "BLOCK", "IRQ_POLL", "TASKLET", "SCHED", "HRTIMER", "RCU")
+
+VMSTAT_FIELDS = ("nr_free_pages", "nr_inactive_anon", "nr_active_anon", "nr_inactive_file", "nr_active_file", "nr_dirty",
+                 "nr_writeback", "pgpgin", "pgpgout", "pswpin", "pswpout", "pgalloc_normal", "pgfree", "pgfault", "pgmajfault",
+                 "pgsteal_kswapd", "pgsteal_direct", "pgscan_kswapd", "pgscan_direct", "oom_kill", "thp_fault_alloc")
+
+SNMP_TCP = ("RtoAlgorithm", "RtoMin", "RtoMax", "MaxConn", "ActiveOpens", "PassiveOpens", "AttemptFails", "EstabResets",
+            "CurrEstab", "InSegs", "OutSegs", "RetransSegs", "InErrs", "OutRsts", "InCsumErrors")
+
+NETSTAT_TCPEXT = ("SyncookiesSent", "SyncookiesRecv", "EmbryonicRsts", "DelayedACKs", "ListenOverflows", "ListenDrops",
+                  "TCPHPHits", "TCPPureAcks", "TCPTimeouts", "TCPBacklogDrop")
+
+#--------------------
+# Fixture
+#--------------------
+
+
+class Fixture(object):
+
+    """synthetic procfs and sysfs tree.
+    write creates the whole tree, tick advances counters and rewrites files of counters.
+    counters are derived from seed, so the same arguments make the same tree.
+    """
+
+    # ratio of IRQ lines which change on a tick, like a real system where most devices are idle.
+    BUSY_IRQS = 0.1
+
+    def __init__(self, root, cpus=4, pids=100, interfaces=2, devices=8, seed=0):
+        self.root = root
+        self.cpus = cpus
+        self.pids = pids
+        self.interfaces = interfaces
+        self.devices = devices
+        self.random = random.Random(seed)
+
+        self.time = 0.0
+        self.cpu_times = [[1000, 10, 500, 100000, 50, 5, 20, 0, 0, 0] for i in range(cpus)]
+        self.irq_names = ["%d" % i for i in range(devices + interfaces)] + ["NMI", "LOC", "RES", "CAL", "TLB"]
+        self.irq_counts = [[0] * cpus for name in self.irq_names]
+        self.softirq_counts = [[0] * cpus for name in SOFTIRQS]
+        self.counters = {"ctxt": 0, "processes": self.pids, "intr": 0}
+        self.vmstat = dict.fromkeys(VMSTAT_FIELDS, 0)
+        self.tcp = dict.fromkeys(SNMP_TCP, 0)
+        self.tcpext = dict.fromkeys(NETSTAT_TCPEXT, 0)
+        self.pressure = dict((kind, [0, 0]) for kind in ("cpu", "memory", "io"))
+        # run time(ns), run queue wait time(ns) and timeslices of each CPU.
+        self.schedstat = [[0, 0, 0] for i in range(cpus)]
+
+    def path(self, *paths):
+        return os.path.join(self.root, *paths)
+
+    def write_file(self, content, *paths):
+        path = self.path(*paths)
+        directory = os.path.dirname(path)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        with open(path, "w") as f:
+            f.write(content)
+
+    def write(self):
+        self.write_file("%d\n" % self.pids, "proc", "sys", "kernel", "pid_max")
+        self.write_file("nodev\tproc\nnodev\tsysfs\nnodev\ttmpfs\n\text4\n", "proc", "filesystems")
+        self.write_file("/dev/sda1 / ext4 rw 0 0\nproc /proc proc rw 0 0\nsysfs /sys sysfs rw 0 0\n", "proc", "self", "mounts")
+        self.write_file("%.2f %.2f\n" % (self.time + 1000, self.time * self.cpus), "proc", "uptime")
+
+        self.__write_pids()
+        self.__write_devices()
+        self.__write_sys()
+        self.__write_counters()
+
+    def tick(self, seconds=1.0):
+        """advance counters by seconds, and rewrite files of counters."""
+        self.time += seconds
+        hz = int(100 * seconds)
+
+        for times in self.cpu_times:
+            busy = self.random.randint(0, hz)
+            times[0] += busy * 2 // 3
+            times[2] += busy // 3
+            times[3] += hz - busy
+            # nice, iowait, irq, softirq and steal.
+            for i, most in ((1, 2), (4, 2), (5, 1), (6, 2), (7, 3)):
+                times[i] += self.random.randint(0, most)
+
+        for schedstat in self.schedstat:
+            schedstat[0] += self.random.randint(0, 10 ** 9)
+            schedstat[1] += self.random.randint(0, 10 ** 8) ** 2 // 10 ** 8
+            schedstat[2] += self.random.randint(10, 1000)
+
+        for counts in self.irq_counts + self.softirq_counts:
+            if self.random.random() < self.BUSY_IRQS:
+                cpu = self.random.randrange(self.cpus)
+                counts[cpu] += self.random.randint(1, 1000)
+
+        self.counters["ctxt"] += self.random.randint(100, 10000) * self.cpus
+        self.counters["processes"] += self.random.randint(0, 10)
+        self.counters["intr"] = sum(sum(counts) for counts in self.irq_counts)
+
+        for counters in (self.vmstat, self.tcp, self.tcpext):
+            for name in counters:
+                counters[name] += self.random.randint(0, 3)
+
+        for totals in self.pressure.values():
+            totals[0] += self.random.randint(0, 10000)
+            totals[1] += self.random.randint(0, 1000)
+
+        self.__write_counters()
+
+    def __write_pids(self):
+        for pid in range(1, self.pids + 1):
+            self.write_file("%d (task%d) S 1 %d %d 0 -1 4194560 0 0 0 0 0 0 0 0 20 0 1 0 100 0 0\n" % (pid, pid, pid, pid),
+                            "proc", str(pid), "stat")
+
+    def __write_devices(self):
+        lines = ["Inter-|   Receive                                                |  Transmit",
+                 " face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed"]
+        lines += ["eth%d: 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0" % i for i in range(self.interfaces)]
+        self.write_file("\n".join(lines) + "\n", "proc", "net", "dev")
+
+        lines = ["   8 %7d sd%s 0 0 0 0 0 0 0 0 0 0 0" % (i, self.__device_name(i)) for i in range(self.devices)]
+        self.write_file("\n".join(lines) + "\n", "proc", "diskstats")
+
+    def __device_name(self, i):
+        name = ""
+        i += 1
+        while i:
+            i, r = divmod(i - 1, 26)
+            name = chr(ord("a") + r) + name
+        return name
+
+    def __write_sys(self):
+        cpu_dir = ("sys", "devices", "system", "cpu")
+        hwmon = ("sys", "class", "hwmon", "hwmon0")
+        self.write_file("coretemp\n", *hwmon + ("name",))
+        self.write_file("Package id 0\n", *hwmon + ("temp1_label",))
+        self.write_file("60000\n", *hwmon + ("temp1_input",))
+
+        for i in range(self.cpus):
+            cpu = cpu_dir + ("cpu%d" % i,)
+            self.write_file("%d\n" % (2000000 + i), *cpu + ("cpufreq", "scaling_cur_freq"))
+            self.write_file("0\n", *cpu + ("thermal_throttle", "core_throttle_count"))
+            self.write_file("0\n", *cpu + ("topology", "physical_package_id"))
+            self.write_file("%d\n" % i, *cpu + ("topology", "core_id"))
+            self.write_file("Core %d\n" % i, *hwmon + ("temp%d_label" % (i + 2),))
+            self.write_file("%d\n" % (50000 + i % 20 * 1000), *hwmon + ("temp%d_input" % (i + 2),))
+
+    def __write_counters(self):
+        self.__write_stat()
+        self.__write_interrupts()
+        self.__write_meminfo()
+        self.__write_net()
+
+        self.write_file("".join("%s %d\n" % (name, self.vmstat[name]) for name in VMSTAT_FIELDS), "proc", "vmstat")
+        self.write_file("0.50 0.40 0.30 2/%d %d\n" % (self.pids, self.pids), "proc", "loadavg")
+
+        self.__write_schedstat()
+
+        for kind, (some, full) in self.pressure.items():
+            self.write_file("some avg10=0.00 avg60=0.00 avg300=0.00 total=%d\nfull avg10=0.00 avg60=0.00 avg300=0.00 total=%d\n" % (some, full),
+                            "proc", "pressure", kind)
+
+    def __write_stat(self):
+        total = [sum(column) for column in zip(*self.cpu_times)]
+        lines = ["cpu  " + " ".join(map(str, total))]
+        lines += ["cpu%d %s" % (i, " ".join(map(str, times))) for i, times in enumerate(self.cpu_times)]
+        lines += ["intr %d %s" % (self.counters["intr"], " ".join("0" for name in self.irq_names)),
+                  "ctxt %d" % self.counters["ctxt"],
+                  "btime 1700000000",
+                  "processes %d" % self.counters["processes"],
+                  "procs_running %d" % self.random.randint(1, self.cpus + 1),
+                  "procs_blocked %d" % self.random.randint(0, 2),
+                  "softirq 0 " + " ".join("0" for name in SOFTIRQS)]
+        self.write_file("\n".join(lines) + "\n", "proc", "stat")
+
+    def __write_schedstat(self):
+        lines = ["version 15", "timestamp %d" % (self.time * 250)]
+        for i, (run, wait, slices) in enumerate(self.schedstat):
+            lines.append("cpu%d 0 0 0 0 0 0 %d %d %d" % (i, run, wait, slices))
+            # domains of SMT, MC and NUMA levels.
+            lines += ["domain%d %s%s" % (level, "f" * 4, " 0" * 45) for level in range(3)]
+        self.write_file("\n".join(lines) + "\n", "proc", "schedstat")
+
+    def __write_interrupts(self):
+        header = " " * 11 + "".join("CPU%-8d" % i for i in range(self.cpus)).rstrip()
+
+        lines = [header]
+        for i, (name, counts) in enumerate(zip(self.irq_names, self.irq_counts)):
+            if name.isdigit():
+                device = "eth%d-rx" % (i - self.devices) if i >= self.devices else "sd%s" % self.__device_name(i)
+                description = "IR-PCI-MSI %d-edge %s" % (i, device)
+            else:
+                description = "Local timer interrupts"
+            lines.append("%4s: %s   %s" % (name, " ".join("%10d" % c for c in counts), description))
+        self.write_file("\n".join(lines) + "\n", "proc", "interrupts")
+
+        lines = [header]
+        lines += ["%9s: %s" % (name, " ".join("%10d" % c for c in counts)) for name, counts in zip(SOFTIRQS, self.softirq_counts)]
+        self.write_file("\n".join(lines) + "\n", "proc", "softirqs")
+
+    def __write_meminfo(self):
+        total = 16 * 1024 * 1024
+        free = total // 4 + self.random.randint(0, 1024)
+        fields = (("MemTotal", total), ("MemFree", free), ("MemAvailable", total // 2), ("Buffers", 100000), ("Cached", 2000000),
+                  ("SwapCached", 0), ("SwapTotal", 2097148), ("SwapFree", 2000000), ("Zswap", 0), ("Dirty", 1000), ("Writeback", 0),
+                  ("SReclaimable", 200000), ("HugePages_Total", 0), ("HugePages_Free", 0), ("Hugepagesize", 2048))
+        self.write_file("".join("%s:%16d kB\n" % field for field in fields), "proc", "meminfo")
+
+    def __write_net(self):
+        snmp = ["Ip: Forwarding DefaultTTL", "Ip: 1 64",
+                "Tcp: " + " ".join(SNMP_TCP), "Tcp: " + " ".join(str(self.tcp[name]) for name in SNMP_TCP),
+                "Udp: InDatagrams NoPorts", "Udp: 0 0"]
+        self.write_file("\n".join(snmp) + "\n", "proc", "net", "snmp")
+
+        netstat = ["TcpExt: " + " ".join(NETSTAT_TCPEXT), "TcpExt: " + " ".join(str(self.tcpext[name]) for name in NETSTAT_TCPEXT),
+                   "IpExt: InNoRoutes", "IpExt: 0"]
+        self.write_file("\n".join(netstat) + "\n", "proc", "net", "netstat")
+
+        self.write_file("sockets: used %d\nTCP: inuse %d orphan 0 tw %d alloc %d mem 1\nUDP: inuse 0 mem 0\n"
+                        % (self.pids, self.tcp["CurrEstab"], self.pids // 10, self.tcp["CurrEstab"]), "proc", "net", "sockstat")
+
+#=======================================
+# Functions
+#=======================================
+
+
+def main():
+    args = docopt(__doc__)
+    fixture = Fixture(args["<directory>"], int(args["--cpus"]), int(args["--pids"]), int(args["--interfaces"]),
+                      int(args["--devices"]), int(args["--seed"]))
+    fixture.write()
+    fixture.tick()
+
+if __name__ == "__main__":
+    main()
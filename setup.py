@@ -21,7 +21,7 @@ setup(
     author_email = ttop.__email__,
     packages = ["ttop"],
     entry_points = {
-        "console_scripts": ["ttop = ttop.ttop:main"]
+        "console_scripts": ["ttop = ttop.__main__:main"]
     },
     install_requires = open("requirements.txt").read().splitlines(),
     classifiers = [
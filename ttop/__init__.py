@@ -7,3 +7,27 @@ __email__ = "tonton1517@gmail.com"
 __homepage__ = "https://github.com/ton1517/ttop"
 __version__ = "0.9.1"
 __license__ = "MIT License"
+
+
+# the API is imported lazily. setup.py imports this package before dependencies are installed.
+
+
+def stream(interval=1.0):
+    """async iterator of ttop.api.Snapshot every interval seconds. consumers of same interval share one sampler."""
+    from ttop import api
+    return api.stream(interval)
+
+
+def snapshots(interval=1.0):
+    """iterator of ttop.api.Snapshot every interval seconds. consumers of same interval share one sampler."""
+    from ttop import api
+    return api.snapshots(interval)
+
+
+def __getattr__(name):
+    # Sampler and Snapshot as ttop.Sampler and ttop.Snapshot on python 3.7 or later.
+    if name in ("Sampler", "Snapshot"):
+        from ttop import api
+        return getattr(api, name)
+
+    raise AttributeError("module 'ttop' has no attribute " + repr(name))
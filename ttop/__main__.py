@@ -0,0 +1,21 @@
+import sys
+
+#=======================================
+# Entry point
+#=======================================
+
+
+def main():
+    """run ttop. ttop status is dispatched before the TUI and its dependencies are imported,
+    because tmux runs it every few seconds.
+    """
+    if sys.argv[1:2] == ["status"]:
+        from ttop import status
+        if status.main(sys.argv[2:]):
+            return
+
+    from ttop import ttop
+    ttop.main()
+
+if __name__ == "__main__":
+    main()
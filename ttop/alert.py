@@ -0,0 +1,159 @@
+import re
+import curses
+
+from ttop import core, tmux
+
+#=======================================
+# Alert
+#=======================================
+
+
+def _cpu_value(cpu):
+    return cpu.usedPercent.percent
+
+
+def _memory_value(memory):
+    return memory.percent.percent
+
+# metric name: (function returns resources of SystemStatus, function returns value of resource)
+METRICS = {
+    "cpu": (lambda ss: [ss.cpu], _cpu_value),
+    "core": (lambda ss: ss.each_cpu, _cpu_value),
+    "mem": (lambda ss: [ss.memory], _memory_value),
+    "swap": (lambda ss: [ss.swap], _memory_value),
+    "load1": (lambda ss: [ss.loadavg], lambda loadavg: loadavg.avg1),
+    "load5": (lambda ss: [ss.loadavg], lambda loadavg: loadavg.avg5),
+    "load15": (lambda ss: [ss.loadavg], lambda loadavg: loadavg.avg15),
+}
+
+# notifier name: function(message, scr). ansi screen has its own beep, curses.beep doesn't work without curses.
+NOTIFIERS = {
+    "tmux": lambda message, scr: tmux.display_message(message),
+    "bell": lambda message, scr: getattr(scr, "beep", curses.beep)(),
+}
+
+#--------------------
+# Rule
+#--------------------
+
+
+class Rule(object):
+
+    """threshold rule.
+    it fires when value is beyond threshold for duration seconds,
+    and it is cleared when value is back beyond threshold by HYSTERESIS.
+
+    >>> rule = Rule("load1 > cores*2 for 10")
+    >>> rule.metric, rule.operator, rule.duration
+    ('load1', '>', 10.0)
+    """
+
+    PATTERN = re.compile(r"^\s*(\w+)\s*([<>])\s*([\w.*]+)(?:\s+for\s+([\d.]+)s?)?\s*$")
+
+    # ratio of threshold
+    HYSTERESIS = 0.05
+
+    def __init__(self, text):
+        result = self.PATTERN.match(text)
+        if not result or result.group(1) not in METRICS:
+            raise ValueError("invalid alert rule: " + text)
+
+        self.text = text.strip()
+        self.metric, self.operator = result.group(1), result.group(2)
+        self.threshold = self.__parse_threshold(text, result.group(3))
+        self.duration = float(result.group(4) or 0.0)
+        self.margin = abs(self.threshold) * self.HYSTERESIS
+
+        self.get_resources, self.get_value = METRICS[self.metric]
+        self.aggregate = max if self.operator == ">" else min
+
+        self.since = None
+        self.active = False
+
+    def __parse_threshold(self, text, threshold):
+        value = 1.0
+        for factor in threshold.split("*"):
+            if factor == "cores":
+                value *= core.CPU.NUM_CPUS
+            else:
+                try:
+                    value *= float(factor)
+                except ValueError:
+                    raise ValueError("invalid alert rule: " + text)
+
+        return value
+
+    def measure(self, system_status):
+        """return value of metric, the worst of its resources."""
+        return self.aggregate(self.get_value(r) for r in self.get_resources(system_status))
+
+    def beyond(self, value, margin=0.0):
+        if self.operator == ">":
+            return value > self.threshold - margin
+        else:
+            return value < self.threshold + margin
+
+    def evaluate(self, value, now):
+        """update state by value. return True if the rule fires now."""
+        if self.active:
+            if not self.beyond(value, self.margin):
+                self.active = False
+                self.since = None
+            return False
+
+        if not self.beyond(value):
+            self.since = None
+            return False
+
+        if self.since is None:
+            self.since = now
+
+        if now - self.since >= self.duration:
+            self.active = True
+            return True
+
+        return False
+
+    def __str__(self):
+        return self.text
+
+#--------------------
+# AlertEngine
+#--------------------
+
+
+class AlertEngine(object):
+
+    """evaluate rules on every SystemStatus sample.
+    each rule keeps only its own state, so a tick costs O(rules) after metrics are aggregated once.
+    """
+
+    def __init__(self, rules, notifiers=(), scr=None):
+        self.rules = [Rule(rule) for rule in rules]
+        self.notifiers = [NOTIFIERS[name] for name in notifiers if name in NOTIFIERS]
+        self.scr = scr
+
+    def evaluate(self, system_status, now):
+        values = {}
+        for rule in self.rules:
+            key = (rule.metric, rule.operator)
+            if key not in values:
+                values[key] = rule.measure(system_status)
+
+            if rule.evaluate(values[key], now):
+                self.notify("ttop: " + str(rule))
+
+    def notify(self, message):
+        for notifier in self.notifiers:
+            try:
+                notifier(message, self.scr)
+            except curses.error:
+                pass
+
+    def is_alerting(self, metric, resource):
+        """return True if resource is beyond threshold of an active rule of metric."""
+        for rule in self.rules:
+            if rule.active and rule.metric == metric and rule.beyond(rule.get_value(resource), rule.margin):
+                return True
+
+        return False
@@ -0,0 +1,278 @@
+import os
+import re
+import sys
+import tty
+import time
+import fcntl
+import curses
+import select
+import signal
+import struct
+import termios
+
+from ttop import color
+
+#=======================================
+# ANSI backend
+#=======================================
+
+CSI = "\x1b["
+
+# alternate screen, hidden cursor and clear screen.
+ENTER = CSI + "?1049h" + CSI + "?25l" + CSI + "2J"
+LEAVE = CSI + "0m" + CSI + "?25h" + CSI + "?1049l"
+
+# synchronized output. the terminal shows the frame at once when it is ended.
+SYNC_BEGIN = CSI + "?2026h"
+SYNC_END = CSI + "?2026l"
+
+# DECRQM of synchronized output. a terminal which supports it answers CSI ? 2026 ; 1 $ y or CSI ? 2026 ; 2 $ y.
+SYNC_QUERY = CSI + "?2026$p"
+SYNC_REPLY = re.compile(br"\x1b\[\?2026;([0-4])\$y")
+
+# color pair number: (foreground, background). curses color numbers are same as ANSI colors, -1 is default.
+PAIRS = {0: (-1, -1)}
+
+
+def write_all(fd, data):
+    if not isinstance(data, bytes):
+        data = data.encode("utf-8")
+
+    while data:
+        data = data[os.write(fd, data):]
+
+
+def terminal_size(fd):
+    """return (lines, columns) of terminal."""
+    try:
+        size = fcntl.ioctl(fd, termios.TIOCGWINSZ, b"\0" * 8)
+        lines, columns = struct.unpack("hhhh", size)[:2]
+    except (IOError, OSError):
+        lines, columns = 0, 0
+
+    return lines or 24, columns or 80
+
+
+def query_synchronized_output(fd_in, fd_out, timeout=0.1):
+    """return True if terminal supports synchronized output."""
+    write_all(fd_out, SYNC_QUERY)
+
+    reply = b""
+    deadline = time.time() + timeout
+    while not reply.endswith(b"$y"):
+        remaining = deadline - time.time()
+        if remaining <= 0 or not select.select([fd_in], [], [], remaining)[0]:
+            break
+        reply += os.read(fd_in, 64)
+
+    result = SYNC_REPLY.search(reply)
+    return bool(result) and result.group(1) in (b"1", b"2")
+
+#--------------------
+# AnsiColorTable
+#--------------------
+
+
+class AnsiColorTable(color.ColorTable):
+
+    """ColorTable of AnsiScreen. attributes have same bits as curses, so color themes and views work as they are."""
+
+    def _color_pair(self, number):
+        # same as curses.color_pair.
+        return number << 8
+
+    def _define_color(self, fg, bg):
+        self.pair_number += 1
+        PAIRS[self.pair_number] = (fg, bg)
+        return self._color_pair(self.pair_number)
+
+#--------------------
+# AnsiScreen
+#--------------------
+
+
+class AnsiScreen(object):
+
+    """curses like screen which writes a frame of ANSI sequences by one os.write.
+
+    only rows changed since the last frame are written, and nothing is written if no row is changed.
+    if synchronized is True, a frame is wrapped in synchronized output, so terminal never shows half drawn frames.
+    """
+
+    def __init__(self, fd_in, fd_out, resize_fd=None, synchronized=False):
+        self.fd_in = fd_in
+        self.fd_out = fd_out
+        self.resize_fd = resize_fd
+        self.synchronized = synchronized
+
+        self.sgr = {}
+        self.keys = bytearray()
+        self.resizeterm(*terminal_size(fd_out))
+
+    def resizeterm(self, lines, columns):
+        self.lines = lines
+        self.columns = columns
+        self.blank_chars = [" "] * columns
+        self.blank_attrs = [0] * columns
+
+        self.chars = [list(self.blank_chars) for i in range(lines)]
+        self.attrs = [list(self.blank_attrs) for i in range(lines)]
+
+        # rows of the last frame. None means the row must be written.
+        self.last = [None] * lines
+        self.clear = True
+
+    def getmaxyx(self):
+        return self.lines, self.columns
+
+    def erase(self):
+        for y in range(self.lines):
+            self.chars[y][:] = self.blank_chars
+            self.attrs[y][:] = self.blank_attrs
+
+    def addstr(self, y, x, s, attr=0):
+        if not 0 <= y < self.lines or x >= self.columns:
+            raise curses.error("addstr() returned ERR")
+
+        if x < 0:
+            s, x = s[-x:], 0
+        s = s[:self.columns - x]
+
+        self.chars[y][x:x + len(s)] = s
+        self.attrs[y][x:x + len(s)] = [attr] * len(s)
+
+    def addch(self, y, x, ch, attr=0):
+        self.addstr(y, x, ch, attr)
+
+    def inch(self, y, x):
+        if not (0 <= y < self.lines and 0 <= x < self.columns):
+            raise curses.error("inch() returned ERR")
+
+        return ord(self.chars[y][x]) | self.attrs[y][x]
+
+    def refresh(self):
+        frame = []
+        attr = 0
+        for y in range(self.lines):
+            row = (self.chars[y], self.attrs[y])
+            if row != self.last[y]:
+                attr = self.__render_row(y, attr, frame)
+                self.last[y] = (list(row[0]), list(row[1]))
+
+        if not frame:
+            return
+
+        if self.clear:
+            frame.insert(0, CSI + "2J")
+            self.clear = False
+
+        # every frame starts with default attribute.
+        if attr:
+            frame.append(CSI + "0m")
+        if self.synchronized:
+            frame.insert(0, SYNC_BEGIN)
+            frame.append(SYNC_END)
+
+        write_all(self.fd_out, "".join(frame))
+
+    def __render_row(self, y, attr, frame):
+        """append row y to frame. attr is current attribute of terminal, and new one is returned."""
+        chars, attrs = self.chars[y], self.attrs[y]
+
+        # the bottom right cell is not written, terminal may scroll by it.
+        end = self.columns - 1 if y == self.lines - 1 else self.columns
+
+        frame.append(CSI + "%d;1H" % (y + 1))
+        start = 0
+        for x in range(end):
+            if attrs[x] != attr:
+                frame.append("".join(chars[start:x]))
+                frame.append(self.__sgr(attrs[x]))
+                attr = attrs[x]
+                start = x
+        frame.append("".join(chars[start:end]))
+
+        return attr
+
+    def __sgr(self, attr):
+        sgr = self.sgr.get(attr)
+        if sgr is not None:
+            return sgr
+
+        codes = ["0"]
+        for flag, code in ((curses.A_BOLD, "1"), (curses.A_UNDERLINE, "4"), (curses.A_REVERSE, "7")):
+            if attr & flag:
+                codes.append(code)
+
+        fg, bg = PAIRS.get((attr & curses.A_COLOR) >> 8, (-1, -1))
+        if fg >= 0:
+            codes.append("3%d" % fg)
+        if bg >= 0:
+            codes.append("4%d" % bg)
+
+        sgr = self.sgr[attr] = CSI + ";".join(codes) + "m"
+        return sgr
+
+    def beep(self):
+        write_all(self.fd_out, "\a")
+
+    def getch(self):
+        """wait and return a key. return curses.KEY_RESIZE if terminal is resized.
+        escape sequences such as arrow keys are ignored and -1 is returned.
+        """
+        if not self.keys:
+            fds = [self.fd_in] + ([self.resize_fd] if self.resize_fd is not None else [])
+            readable = select_retry(fds)
+
+            if self.resize_fd in readable:
+                os.read(self.resize_fd, 64)
+                return curses.KEY_RESIZE
+
+            self.keys = bytearray(os.read(self.fd_in, 64))
+            if len(self.keys) > 1 and self.keys[0] == 27:
+                self.keys = bytearray()
+                return -1
+
+        if not self.keys:
+            return -1
+
+        key = self.keys[0]
+        del self.keys[0]
+        return key
+
+
+def select_retry(fds):
+    """select readable fds. it is retried if a signal interrupts it."""
+    while True:
+        try:
+            return select.select(fds, [], [])[0]
+        except select.error as e:
+            if e.args[0] != 4:  # EINTR
+                raise
+
+#=======================================
+# Functions
+#=======================================
+
+
+def wrapper(function, *args):
+    """same as curses.wrapper, but function gets AnsiScreen."""
+    fd_in, fd_out = sys.stdin.fileno(), sys.stdout.fileno()
+    attributes = termios.tcgetattr(fd_in)
+
+    # SIGWINCH wakes up getch through the pipe.
+    resize_in, resize_out = os.pipe()
+    previous = signal.signal(signal.SIGWINCH, lambda signum, frame: os.write(resize_out, b"."))
+
+    try:
+        tty.setcbreak(fd_in)
+        write_all(fd_out, ENTER)
+
+        synchronized = query_synchronized_output(fd_in, fd_out)
+        return function(AnsiScreen(fd_in, fd_out, resize_in, synchronized), *args)
+    finally:
+        write_all(fd_out, LEAVE)
+        termios.tcsetattr(fd_in, termios.TCSADRAIN, attributes)
+        signal.signal(signal.SIGWINCH, previous)
+        os.close(resize_in)
+        os.close(resize_out)
@@ -0,0 +1,222 @@
+import time
+import threading
+import collections
+
+from ttop import core
+
+#=======================================
+# Embedding API
+#=======================================
+
+#--------------------
+# Snapshot
+#--------------------
+
+# percents are 0 to 100, and cpus has usedPercent of each CPU. memory_used and memory_total are bytes.
+SNAPSHOT_FIELDS = ("time", "cpu", "user", "system", "iowait", "steal", "cpus",
+                   "memory", "memory_used", "memory_total", "swap", "load1", "load5", "load15", "procs")
+
+
+class Snapshot(collections.namedtuple("Snapshot", SNAPSHOT_FIELDS)):
+
+    """immutable values of SystemStatus at one time."""
+
+    __slots__ = ()
+
+    @classmethod
+    def of(cls, system_status, now):
+        ss = system_status
+        return cls(now, ss.cpu.usedPercent.percent, ss.cpu.userPercent.percent, ss.cpu.systemPercent.percent,
+                   ss.cpu.iowaitPercent.percent, ss.cpu.stealPercent.percent, tuple(cpu.usedPercent.percent for cpu in ss.each_cpu),
+                   ss.memory.percent.percent, int(ss.memory.used), int(ss.memory.total), ss.swap.percent.percent,
+                   ss.loadavg.avg1, ss.loadavg.avg5, ss.loadavg.avg15, ss.procs.procs)
+
+#--------------------
+# Sampler
+#--------------------
+
+
+class Sampler(object):
+
+    """sample SystemStatus and share each Snapshot with any number of consumers.
+
+    while a consumer iterates snapshots() or stream(), a background thread samples every interval.
+    the thread stops when the last consumer is closed.
+    an owner which has its own loop calls sample() instead, the TUI does so.
+    a slow consumer gets the latest snapshot, older ones are skipped.
+    """
+
+    def __init__(self, interval=1.0, system_status=None):
+        self.interval = interval
+        self.system_status = system_status or core.SystemStatus()
+
+        self.latest = None
+        self.sequence = 0
+        self.condition = threading.Condition()
+
+        # (loop, future) of async consumers waiting for the next snapshot.
+        self.waiters = []
+        self.consumers = 0
+        self.thread = None
+
+    def sample(self, record=True):
+        """update system status and return new Snapshot. if record is False, statistics and histories are not recorded."""
+        self.system_status.update(record)
+        snapshot = Snapshot.of(self.system_status, time.time())
+
+        with self.condition:
+            self.latest = snapshot
+            self.sequence += 1
+            self.condition.notify_all()
+            waiters, self.waiters = self.waiters, []
+
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_set_result, future, snapshot)
+
+        return snapshot
+
+    def snapshots(self):
+        """iterate new snapshots."""
+        self.attach()
+        try:
+            sequence = self.sequence
+            while True:
+                with self.condition:
+                    while self.sequence == sequence:
+                        self.condition.wait()
+                    sequence, snapshot = self.sequence, self.latest
+                yield snapshot
+        finally:
+            self.detach()
+
+    def stream(self):
+        """iterate new snapshots in async for."""
+        # asyncio is imported only by async consumers, the TUI never pays for it.
+        try:
+            import asyncio
+        except ImportError:
+            raise RuntimeError("stream needs asyncio")
+
+        return _SnapshotStream(self, asyncio)
+
+    def attach(self):
+        """count a consumer, and start sampling thread if it is not running."""
+        with self.condition:
+            self.consumers += 1
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.__run)
+                self.thread.daemon = True
+                self.thread.start()
+
+    def detach(self):
+        with self.condition:
+            self.consumers -= 1
+
+    def _wait_async(self, sequence, loop):
+        """return future of a snapshot newer than sequence."""
+        future = loop.create_future()
+
+        with self.condition:
+            if self.sequence != sequence:
+                future.set_result(self.latest)
+            else:
+                self.waiters.append((loop, future))
+
+        return future
+
+    def __run(self):
+        next_time = time.time()
+        while True:
+            next_time += self.interval
+            time.sleep(max(next_time - time.time(), 0.0))
+
+            with self.condition:
+                if not self.consumers:
+                    self.thread = None
+                    return
+
+            self.sample()
+
+#--------------------
+# _SnapshotStream
+#--------------------
+
+
+class _SnapshotStream(object):
+
+    """async iterator of Sampler. it is detached when it is closed or collected."""
+
+    def __init__(self, sampler, asyncio):
+        self.sampler = sampler
+        self.asyncio = asyncio
+        self.sequence = None
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        if self.closed:
+            raise StopAsyncIteration
+
+        if self.sequence is None:
+            self.sequence = self.sampler.sequence
+            self.sampler.attach()
+
+        future = self.sampler._wait_async(self.sequence, self.asyncio.get_event_loop())
+        future.add_done_callback(self.__done)
+        return future
+
+    def __done(self, future):
+        if not future.cancelled():
+            self.sequence = self.sampler.sequence
+
+    def aclose(self):
+        future = self.asyncio.get_event_loop().create_future()
+        self.close()
+        future.set_result(None)
+        return future
+
+    def close(self):
+        if not self.closed and self.sequence is not None:
+            self.sampler.detach()
+        self.closed = True
+
+    def __del__(self):
+        self.close()
+
+
+def _set_result(future, snapshot):
+    # a waiting consumer may have been cancelled.
+    if not future.done():
+        future.set_result(snapshot)
+
+#=======================================
+# Functions
+#=======================================
+
+# shared samplers by interval.
+_samplers = {}
+_samplers_lock = threading.Lock()
+
+
+def shared_sampler(interval=1.0):
+    """return Sampler shared by all consumers of interval."""
+    with _samplers_lock:
+        if interval not in _samplers:
+            _samplers[interval] = Sampler(interval)
+        return _samplers[interval]
+
+
+def stream(interval=1.0):
+    """async iterator of snapshots every interval seconds.
+    example:
+        async for snapshot in ttop.stream(interval=1.0):
+            print(snapshot.cpu)
+    """
+    return shared_sampler(interval).stream()
+
+
+def snapshots(interval=1.0):
+    """iterator of snapshots every interval seconds."""
+    return shared_sampler(interval).snapshots()
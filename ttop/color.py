@@ -18,15 +18,15 @@ class ColorTable(object):
     def __init__(self):
         self.pair_number = 0
 
-        self.DEFAULT = curses.color_pair(0)
-        self.BLACK = self.__define_color(curses.COLOR_BLACK, -1)
-        self.WHITE = self.__define_color(curses.COLOR_WHITE, -1)
-        self.BLUE = self.__define_color(curses.COLOR_BLUE, -1)
-        self.CYAN = self.__define_color(curses.COLOR_CYAN, -1)
-        self.GREEN = self.__define_color(curses.COLOR_GREEN, -1)
-        self.MAGENTA = self.__define_color(curses.COLOR_MAGENTA, -1)
-        self.RED = self.__define_color(curses.COLOR_RED, -1)
-        self.YELLOW = self.__define_color(curses.COLOR_YELLOW, -1)
+        self.DEFAULT = self._color_pair(0)
+        self.BLACK = self._define_color(curses.COLOR_BLACK, -1)
+        self.WHITE = self._define_color(curses.COLOR_WHITE, -1)
+        self.BLUE = self._define_color(curses.COLOR_BLUE, -1)
+        self.CYAN = self._define_color(curses.COLOR_CYAN, -1)
+        self.GREEN = self._define_color(curses.COLOR_GREEN, -1)
+        self.MAGENTA = self._define_color(curses.COLOR_MAGENTA, -1)
+        self.RED = self._define_color(curses.COLOR_RED, -1)
+        self.YELLOW = self._define_color(curses.COLOR_YELLOW, -1)
 
         self.BBLACK = self.BLACK | curses.A_BOLD
         self.BWHITE = self.WHITE | curses.A_BOLD
@@ -37,10 +37,13 @@ class ColorTable(object):
         self.BRED = self.RED | curses.A_BOLD
         self.BYELLOW = self.YELLOW | curses.A_BOLD
 
-    def __define_color(self, fg, bg):
+    def _color_pair(self, number):
+        return curses.color_pair(number)
+
+    def _define_color(self, fg, bg):
         self.pair_number += 1
         curses.init_pair(self.pair_number, fg, bg)
-        return curses.color_pair(self.pair_number)
+        return self._color_pair(self.pair_number)
 
 #--------------------
 # MonoColorTheme
@@ -60,14 +63,50 @@ class MonoColorTheme(object):
 
         self.CPU_GAUGE_USER = color.DEFAULT
         self.CPU_GAUGE_SYSTEM = color.DEFAULT
+        self.CPU_GAUGE_NICE = color.DEFAULT
+        self.CPU_GAUGE_IOWAIT = color.DEFAULT
+        self.CPU_GAUGE_IRQ = color.DEFAULT
+        self.CPU_GAUGE_SOFTIRQ = color.DEFAULT
+        self.CPU_GAUGE_STEAL = color.DEFAULT
+        self.RUNQUEUE_HEAT_LOW = color.DEFAULT
+        self.RUNQUEUE_HEAT_MEDIUM = color.DEFAULT
+        self.RUNQUEUE_HEAT_HIGH = color.DEFAULT
 
         self.MEM_GAUGE_USED = color.DEFAULT
+        self.MEM_GAUGE_BUFFERS = color.DEFAULT
+        self.MEM_GAUGE_CACHED = color.DEFAULT
+        self.MEM_GAUGE_DIRTY = color.DEFAULT
+
+        self.FS_GAUGE_USED = color.DEFAULT
+        self.STALE = color.DEFAULT | curses.A_UNDERLINE
 
         self.UPTIME = color.DEFAULT
         self.LOADAVG1 = color.DEFAULT
         self.LOADAVG5 = color.DEFAULT
         self.LOADAVG15 = color.DEFAULT
         self.PROCS = color.DEFAULT
+        self.INTERVAL = color.DEFAULT
+
+        self.STATS = color.DEFAULT
+        self.RATE = color.DEFAULT
+        self.STATS_MARKER = color.DEFAULT
+
+        self.ALERT = color.DEFAULT | curses.A_REVERSE
+        self.THROTTLED = color.DEFAULT | curses.A_UNDERLINE
+
+        self.PSI_GAUGE_SOME = color.DEFAULT
+        self.PSI_GAUGE_FULL = color.DEFAULT
+        self.PSI_GAUGE_CPU = color.DEFAULT
+        self.PSI_GAUGE_MEMORY = color.DEFAULT
+        self.PSI_GAUGE_IO = color.DEFAULT
+
+        self.SCHED_GAUGE_CTXT = color.DEFAULT
+        self.SCHED_GAUGE_FORKS = color.DEFAULT
+
+        self.PAGING_GAUGE_SWAPIN = color.DEFAULT
+        self.PAGING_GAUGE_SWAPOUT = color.DEFAULT
+        self.PAGING_GAUGE_MAJFAULT = color.DEFAULT
+        self.PAGING_GAUGE_SCAN = color.DEFAULT
 
 #--------------------
 # DefaultColorTheme
@@ -85,14 +124,50 @@ class DefaultColorTheme(MonoColorTheme):
 
         self.CPU_GAUGE_USER = color.GREEN
         self.CPU_GAUGE_SYSTEM = color.RED
+        self.CPU_GAUGE_NICE = color.BLUE
+        self.CPU_GAUGE_IOWAIT = color.BBLACK
+        self.CPU_GAUGE_IRQ = color.YELLOW
+        self.CPU_GAUGE_SOFTIRQ = color.MAGENTA
+        self.CPU_GAUGE_STEAL = color.CYAN
+        self.RUNQUEUE_HEAT_LOW = color.GREEN
+        self.RUNQUEUE_HEAT_MEDIUM = color.YELLOW
+        self.RUNQUEUE_HEAT_HIGH = color.RED
 
         self.MEM_GAUGE_USED = color.GREEN
+        self.MEM_GAUGE_BUFFERS = color.BLUE
+        self.MEM_GAUGE_CACHED = color.YELLOW
+        self.MEM_GAUGE_DIRTY = color.RED
+
+        self.FS_GAUGE_USED = color.CYAN
+        self.STALE = color.BBLACK | curses.A_REVERSE
 
         self.UPTIME = color.GREEN
         self.LOADAVG1 = color.BBLACK
         self.LOADAVG5 = color.WHITE
         self.LOADAVG15 = color.BWHITE
         self.PROCS = color.GREEN
+        self.INTERVAL = color.BBLACK
+
+        self.STATS = color.WHITE
+        self.RATE = color.CYAN
+        self.STATS_MARKER = color.BYELLOW
+
+        self.ALERT = color.RED | curses.A_REVERSE
+        self.THROTTLED = color.YELLOW | curses.A_REVERSE
+
+        self.PSI_GAUGE_SOME = color.YELLOW
+        self.PSI_GAUGE_FULL = color.RED
+        self.PSI_GAUGE_CPU = color.GREEN
+        self.PSI_GAUGE_MEMORY = color.YELLOW
+        self.PSI_GAUGE_IO = color.MAGENTA
+
+        self.SCHED_GAUGE_CTXT = color.BLUE
+        self.SCHED_GAUGE_FORKS = color.RED
+
+        self.PAGING_GAUGE_SWAPIN = color.GREEN
+        self.PAGING_GAUGE_SWAPOUT = color.YELLOW
+        self.PAGING_GAUGE_MAJFAULT = color.MAGENTA
+        self.PAGING_GAUGE_SCAN = color.RED
 
 #--------------------
 # BrightColorTheme
@@ -108,13 +183,49 @@ class BrightColorTheme(MonoColorTheme):
 
         self.CPU_GAUGE_USER = color.BGREEN
         self.CPU_GAUGE_SYSTEM = color.BRED
+        self.CPU_GAUGE_NICE = color.BBLUE
+        self.CPU_GAUGE_IOWAIT = color.BBLACK
+        self.CPU_GAUGE_IRQ = color.BYELLOW
+        self.CPU_GAUGE_SOFTIRQ = color.BMAGENTA
+        self.CPU_GAUGE_STEAL = color.BCYAN
+        self.RUNQUEUE_HEAT_LOW = color.BGREEN
+        self.RUNQUEUE_HEAT_MEDIUM = color.BYELLOW
+        self.RUNQUEUE_HEAT_HIGH = color.BRED
 
         self.MEM_GAUGE_USED = color.BGREEN
+        self.MEM_GAUGE_BUFFERS = color.BBLUE
+        self.MEM_GAUGE_CACHED = color.BYELLOW
+        self.MEM_GAUGE_DIRTY = color.BRED
+
+        self.FS_GAUGE_USED = color.BCYAN
+        self.STALE = color.WHITE | curses.A_REVERSE
 
         self.UPTIME = color.YELLOW
         self.LOADAVG1 = color.BBLACK
         self.LOADAVG5 = color.WHITE
         self.LOADAVG15 = color.BWHITE
         self.PROCS = color.YELLOW
+        self.INTERVAL = color.WHITE
+
+        self.STATS = color.BWHITE
+        self.RATE = color.BCYAN
+        self.STATS_MARKER = color.BYELLOW
+
+        self.ALERT = color.BRED | curses.A_REVERSE
+        self.THROTTLED = color.BYELLOW | curses.A_REVERSE
+
+        self.PSI_GAUGE_SOME = color.BYELLOW
+        self.PSI_GAUGE_FULL = color.BRED
+        self.PSI_GAUGE_CPU = color.BGREEN
+        self.PSI_GAUGE_MEMORY = color.BYELLOW
+        self.PSI_GAUGE_IO = color.BMAGENTA
+
+        self.SCHED_GAUGE_CTXT = color.BBLUE
+        self.SCHED_GAUGE_FORKS = color.BRED
+
+        self.PAGING_GAUGE_SWAPIN = color.BGREEN
+        self.PAGING_GAUGE_SWAPOUT = color.BYELLOW
+        self.PAGING_GAUGE_MAJFAULT = color.BMAGENTA
+        self.PAGING_GAUGE_SCAN = color.BRED
 
         self.LABEL = color.WHITE
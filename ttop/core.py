@@ -1,6 +1,55 @@
+import os
 import psutil
-import copy
 import curses
+import collections
+import heapq
+import operator
+import threading
+from array import array
+
+try:
+    from queue import Queue
+except ImportError:
+    from Queue import Queue
+
+#=======================================
+# Root
+#=======================================
+
+# procfs and sysfs are read under ROOT. if TTOP_ROOT is set, samplers read a fixture tree under it.
+ROOT = os.getenv("TTOP_ROOT", "/")
+PROC_ROOT = os.path.join(ROOT, "proc")
+SYS_ROOT = os.path.join(ROOT, "sys")
+
+# psutil reads procfs under PROCFS_PATH on Linux.
+psutil.PROCFS_PATH = PROC_ROOT
+
+
+def set_root(root):
+    """read procfs and sysfs under root.
+    values which are read at import are read again, so call it before SystemStatus and views are created.
+    """
+    global ROOT, PROC_ROOT, SYS_ROOT
+    ROOT = root
+    PROC_ROOT = os.path.join(root, "proc")
+    SYS_ROOT = os.path.join(root, "sys")
+    psutil.PROCFS_PATH = PROC_ROOT
+
+    CPU.NUM_CPUS = count_cpus()
+    PressureSet.AVAILABLE = readable(os.path.join(PROC_ROOT, "pressure", "cpu"))
+    RunQueue.AVAILABLE = readable(os.path.join(PROC_ROOT, "schedstat"))
+    Filesystem.MOUNTPOINTS = storage_mountpoints()
+
+
+def count_cpus():
+    """return number of CPUs in /proc/stat. if it can not be read, return psutil.cpu_count()."""
+    try:
+        with open(os.path.join(PROC_ROOT, "stat")) as f:
+            ids = [int(line.split()[0][3:]) for line in f if line.startswith("cpu") and line[3].isdigit()]
+    except (IOError, OSError, ValueError):
+        ids = []
+
+    return max(ids) + 1 if ids else psutil.cpu_count()
 
 #=======================================
 # Core Classes
@@ -45,6 +94,30 @@ class Bytes(int):
     def __str__(self):
         return str(int(self.real/Bytes.MEGABYTE)) + "M"
 
+#--------------------
+# Rate
+#--------------------
+
+
+class Rate(float):
+
+    """events per second.
+
+    >>> print(Rate(12345))
+    12.3k
+    >>> print(Rate(42))
+    42
+    """
+
+    UNITS = (("G", 1000.0 ** 3), ("M", 1000.0 ** 2), ("k", 1000.0))
+
+    def __str__(self):
+        for unit, size in Rate.UNITS:
+            if abs(self.real) >= size:
+                return "%.1f%s" % (self.real / size, unit)
+
+        return "%d" % round(self.real) if abs(self.real) >= 10 else "%.1f" % self.real
+
 #--------------------
 # CPU
 #--------------------
@@ -52,16 +125,38 @@ class Bytes(int):
 
 class CPU(object):
 
-    NUM_CPUS = psutil.cpu_count()
+    NUM_CPUS = count_cpus()
+
+    # WindowQuantile of usedPercent. it is set by SystemStatus.enable_stats.
+    stats = None
 
-    def __init__(self, user=0, system=0, idle=0):
-        self.update(user, system, idle)
+    # frequency(MHz), temperature(degree Celsius) and whether it was thermal throttled since last read.
+    # they are set by CPUSensorReader, None means unknown.
+    freq = None
+    temp = None
+    throttled = False
 
-    def update(self, user, system, idle):
+    def __init__(self, user=0, system=0, idle=0, nice=0, iowait=0, irq=0, softirq=0, steal=0, guest=0):
+        self.update(user, system, idle, nice, iowait, irq, softirq, steal, guest)
+
+    def update(self, user, system, idle, nice=0, iowait=0, irq=0, softirq=0, steal=0, guest=0):
+        """guest is included in user and nice as /proc/stat does.
+        iowait is idle time waiting for I/O, so it is not included in usedPercent.
+        """
         self.userPercent = Percent(user)
         self.systemPercent = Percent(system)
-        self.usedPercent = Percent(user + system)
         self.idlePercent = Percent(idle)
+        self.nicePercent = Percent(nice)
+        self.iowaitPercent = Percent(iowait)
+        self.irqPercent = Percent(irq)
+        self.softirqPercent = Percent(softirq)
+        self.stealPercent = Percent(steal)
+        self.guestPercent = Percent(guest)
+        self.usedPercent = Percent(user + nice + system + irq + softirq + steal)
+
+    def values(self):
+        return (self.userPercent.percent, self.systemPercent.percent, self.idlePercent.percent, self.nicePercent.percent, self.iowaitPercent.percent,
+                self.irqPercent.percent, self.softirqPercent.percent, self.stealPercent.percent, self.guestPercent.percent)
 
     def __str__(self):
         return str(self.usedPercent)
@@ -73,21 +168,101 @@ class CPU(object):
 
 class Memory(object):
 
-    def __init__(self, total=1, used=0):
-        self.update(total, used)
+    """memory usage.
+    buffers, cached, dirty and writeback are given only for physical memory.
+    cached doesn't include dirty and writeback pages.
+    """
+
+    # WindowQuantile of percent. it is set by SystemStatus.enable_stats.
+    stats = None
 
-    def update(self, total, used):
+    def __init__(self, total=1, used=0, buffers=0, cached=0, dirty=0, writeback=0, available=0, hugepages=0, zswap=0):
+        self.update(total, used, buffers, cached, dirty, writeback, available, hugepages, zswap)
+
+    def update(self, total, used, buffers=0, cached=0, dirty=0, writeback=0, available=0, hugepages=0, zswap=0):
         self.total = Bytes(total)
         self.used = Bytes(used)
-        self.percent = Percent((1.0 * used / total) * 100)
+        self.buffers = Bytes(buffers)
+        self.cached = Bytes(cached)
+        self.dirty = Bytes(dirty)
+        self.writeback = Bytes(writeback)
+        self.available = Bytes(available)
+        self.hugepages = Bytes(hugepages)
+        self.zswap = Bytes(zswap)
+
+        self.percent = self.__percent(used)
+        self.buffersPercent = self.__percent(buffers)
+        self.cachedPercent = self.__percent(cached)
+        self.dirtyPercent = self.__percent(dirty + writeback)
+
+    def __percent(self, value):
+        return Percent((1.0 * value / self.total) * 100) if self.total else Percent(0.0)
+
+    def values(self):
+        return (int(self.total), int(self.used), int(self.buffers), int(self.cached), int(self.dirty),
+                int(self.writeback), int(self.available), int(self.hugepages), int(self.zswap))
+
+    def detail_str(self):
+        """return available, hugepages and zswap which exist."""
+        details = []
+        for label, value in (("avail", self.available), ("huge", self.hugepages), ("zswap", self.zswap)):
+            if value:
+                details.append("%s %s" % (label, value))
+
+        return " ".join(details)
 
     def __str__(self):
         return "%s/%s %s" % (self.used, self.total, self.percent)
 
+#--------------------
+# MeminfoReader
+#--------------------
+
+
+class MeminfoReader(object):
+
+    """read /proc/meminfo once and update memory and swap.
+
+    /proc/meminfo is like this. values are kB except HugePages_*.
+        MemTotal:        8056528 kB
+        MemFree:          419380 kB
+        ...
+    """
+
+    FIELDS = ("MemTotal", "MemFree", "MemAvailable", "Buffers", "Cached", "SReclaimable", "Dirty", "Writeback",
+              "SwapTotal", "SwapFree", "HugePages_Total", "HugePages_Free", "Hugepagesize", "Zswap")
+
+    def __init__(self):
+        self.file = ProcFile(os.path.join(PROC_ROOT, "meminfo"))
+
+    def update(self, memory, swap):
+        """return False if /proc/meminfo can not be read."""
+        content = self.file.read()
+        if content is None:
+            return False
+
+        info = dict.fromkeys(self.FIELDS, 0)
+        for line in content.splitlines():
+            name, sep, value = line.partition(":")
+            if name in info:
+                info[name] = int(value.split()[0])
+
+        kb = 1024
+        cached = info["Cached"] + info["SReclaimable"]
+        dirty, writeback = info["Dirty"], info["Writeback"]
+        used = info["MemTotal"] - info["MemFree"] - info["Buffers"] - cached
+        hugepages = (info["HugePages_Total"] - info["HugePages_Free"]) * info["Hugepagesize"]
+
+        memory.update(info["MemTotal"] * kb, max(used, 0) * kb, info["Buffers"] * kb,
+                      max(cached - dirty - writeback, 0) * kb, dirty * kb, writeback * kb,
+                      info["MemAvailable"] * kb, hugepages * kb, info["Zswap"] * kb)
+        swap.update(info["SwapTotal"] * kb, (info["SwapTotal"] - info["SwapFree"]) * kb)
+        return True
+
 #--------------------
 # LoadAverage
 #--------------------
-import os
+import time
 
 
 class LoadAverage(object):
@@ -97,10 +272,14 @@ class LoadAverage(object):
         self.avg5 = 0.0
         self.avg15 = 0.0
 
+        # procfs is read so that the root can be changed. os.getloadavg is used where there is no procfs.
+        self.file = ProcFile(os.path.join(PROC_ROOT, "loadavg"))
+
     def update(self):
+        content = self.file.read()
         try:
-            self.avg1, self.avg5, self.avg15 = os.getloadavg()
-        except os.error:
+            self.avg1, self.avg5, self.avg15 = [float(v) for v in content.split()[:3]] if content else os.getloadavg()
+        except (os.error, ValueError):
             self.avg1, self.avg5, self.avg15 = 0.0, 0.0, 0.0
 
     def __str__(self):
@@ -156,6 +335,1145 @@ class Procs(object):
     def __str__(self):
         return str(self.procs)
 
+#--------------------
+# ProcFile
+#--------------------
+
+
+class ProcFile(object):
+
+    """file of procfs or sysfs. it is kept open and read again from the head."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+
+    def read(self):
+        """return content of file. return None if it can not be read."""
+        try:
+            if self.file is None:
+                self.file = open(self.path)
+
+            self.file.seek(0)
+            return self.file.read()
+        except (IOError, OSError):
+            self.close()
+            return None
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def read_text(path):
+    """read file once. return None if it can not be read."""
+    f = ProcFile(path)
+    content = f.read()
+    f.close()
+    return content.strip() if content is not None else None
+
+
+def readable(path):
+    """return True if file can be read. PSI files exist but fail to read if PSI is disabled."""
+    return read_text(path) is not None
+
+#--------------------
+# Scheduler
+#--------------------
+
+
+class Scheduler(object):
+
+    """scheduler activity. context switches, interrupts and forks are per second.
+    running and blocked are numbers of tasks now.
+    """
+
+    def __init__(self, ctxt=0.0, intr=0.0, forks=0.0, running=0, blocked=0):
+        self.update(ctxt, intr, forks, running, blocked)
+
+    def update(self, ctxt, intr, forks, running, blocked):
+        self.ctxtRate = Rate(ctxt)
+        self.intrRate = Rate(intr)
+        self.forkRate = Rate(forks)
+        self.running = running
+        self.blocked = blocked
+
+    def values(self):
+        return (self.ctxtRate.real, self.intrRate.real, self.forkRate.real, self.running, self.blocked)
+
+    def __str__(self):
+        return "%s/%s/%s" % (self.ctxtRate, self.intrRate, self.forkRate)
+
+#--------------------
+# StatReader
+#--------------------
+
+
+class StatReader(object):
+
+    """CPU percents and scheduler activity from one read of /proc/stat.
+    percents and rates are computed from differences to the previous read.
+    """
+
+    # user, nice, system, idle, iowait, irq, softirq, steal, guest, guest_nice.
+    # old kernels have less fields, they are regarded as 0.
+    CPU_FIELDS = 10
+
+    # guest and guest_nice are included in user and nice, so they are not counted in total.
+    TOTAL_FIELDS = 8
+
+    # counters since boot whose rates are kept, in order of Scheduler arguments.
+    COUNTERS = ("ctxt", "intr", "processes")
+
+    def __init__(self):
+        self.file = ProcFile(os.path.join(PROC_ROOT, "stat"))
+        self.last_cpu_times = {}
+        self.last_counters = None
+        self.last_time = None
+
+    def update(self, cpu, each_cpu, scheduler, now):
+        """return False if /proc/stat can not be read."""
+        content = self.file.read()
+        if content is None:
+            return False
+
+        counters = [0] * len(self.COUNTERS)
+        running = blocked = 0
+
+        for line in content.splitlines():
+            # intr has a counter per IRQ, thousands of fields on large hosts. only cpu lines need all fields.
+            fields = line.split() if line.startswith("cpu") else line.split(None, 2)
+            if not fields:
+                continue
+
+            name = fields[0]
+            if name.startswith("cpu"):
+                index = int(name[3:]) if name != "cpu" else None
+                if index is None:
+                    self.__update_cpu(cpu, name, fields)
+                elif index < len(each_cpu):
+                    self.__update_cpu(each_cpu[index], name, fields)
+            elif name in self.COUNTERS:
+                # the first number of intr is the total, the rest are per IRQ.
+                counters[self.COUNTERS.index(name)] = int(fields[1])
+            elif name == "procs_running":
+                running = int(fields[1])
+            elif name == "procs_blocked":
+                blocked = int(fields[1])
+
+        elapsed = now - self.last_time if self.last_time else 0.0
+        if elapsed > 0:
+            rates = [(c - last) / elapsed for c, last in zip(counters, self.last_counters)]
+        else:
+            rates = [0.0] * len(self.COUNTERS)
+
+        # procs_running includes this process.
+        scheduler.update(rates[0], rates[1], rates[2], max(running - 1, 0), blocked)
+
+        self.last_counters = counters
+        self.last_time = now
+        return True
+
+    def __update_cpu(self, cpu, name, fields):
+        times = [int(v) for v in fields[1:self.CPU_FIELDS + 1]]
+        times += [0] * (self.CPU_FIELDS - len(times))
+        last_times = self.last_cpu_times.get(name)
+        self.last_cpu_times[name] = times
+
+        if last_times is None:
+            return
+
+        deltas = [t - last for t, last in zip(times, last_times)]
+        total = sum(deltas[:self.TOTAL_FIELDS])
+        if total <= 0:
+            return
+
+        user, nice, system, idle, iowait, irq, softirq, steal, guest, guest_nice = [100.0 * d / total for d in deltas]
+        cpu.update(user, system, idle, nice, iowait, irq, softirq, steal, guest + guest_nice)
+
+#--------------------
+# Paging
+#--------------------
+
+
+class Paging(object):
+
+    """paging and reclaim activity per second.
+    scan and steal are pages scanned and reclaimed by kswapd and by direct reclaim.
+    oomKills is number of processes killed by OOM killer since ttop started.
+    """
+
+    def __init__(self, swapin=0.0, swapout=0.0, majfault=0.0, scan_kswapd=0.0, scan_direct=0.0, steal_kswapd=0.0, steal_direct=0.0, oom_kills=0):
+        self.update(swapin, swapout, majfault, scan_kswapd, scan_direct, steal_kswapd, steal_direct, oom_kills)
+
+    def update(self, swapin, swapout, majfault, scan_kswapd, scan_direct, steal_kswapd, steal_direct, oom_kills):
+        self.swapInRate = Rate(swapin)
+        self.swapOutRate = Rate(swapout)
+        self.majfaultRate = Rate(majfault)
+        self.scanKswapdRate = Rate(scan_kswapd)
+        self.scanDirectRate = Rate(scan_direct)
+        self.stealKswapdRate = Rate(steal_kswapd)
+        self.stealDirectRate = Rate(steal_direct)
+        self.oomKills = oom_kills
+
+    def values(self):
+        return (self.swapInRate.real, self.swapOutRate.real, self.majfaultRate.real, self.scanKswapdRate.real,
+                self.scanDirectRate.real, self.stealKswapdRate.real, self.stealDirectRate.real, self.oomKills)
+
+    def __str__(self):
+        return "%s/%s" % (self.swapInRate, self.swapOutRate)
+
+#--------------------
+# VmstatReader
+#--------------------
+
+
+class VmstatReader(object):
+
+    """read counters of Paging from /proc/vmstat.
+    /proc/vmstat has about 200 lines of "name value", and their order doesn't change while running.
+    so line numbers of the fields are found once, and only those lines are parsed after that.
+    if a line doesn't have the expected name, line numbers are found again.
+    """
+
+    # in order of Paging arguments. fields missing on old kernels are 0.
+    FIELDS = ("pswpin", "pswpout", "pgmajfault", "pgscan_kswapd", "pgscan_direct", "pgsteal_kswapd", "pgsteal_direct", "oom_kill")
+
+    def __init__(self):
+        self.file = ProcFile(os.path.join(PROC_ROOT, "vmstat"))
+        self.offsets = None
+        self.first = None
+        self.last = None
+
+    def update(self, paging, now):
+        content = self.file.read()
+        if content is None:
+            return
+
+        lines = content.splitlines()
+        counters = self.__read(lines)
+        if counters is None:
+            self.offsets = self.__find_offsets(lines)
+            counters = self.__read(lines)
+
+        if self.first is None:
+            self.first = counters
+
+        rates = [0.0] * (len(self.FIELDS) - 1)
+        if self.last:
+            last_time, last_counters = self.last
+            elapsed = now - last_time
+            if elapsed > 0:
+                rates = [(c - last) / elapsed for c, last in zip(counters[:-1], last_counters[:-1])]
+
+        self.last = (now, counters)
+        paging.update(*(rates + [counters[-1] - self.first[-1]]))
+
+    def __find_offsets(self, lines):
+        names = [line.partition(" ")[0] for line in lines]
+        return [names.index(name) if name in names else None for name in self.FIELDS]
+
+    def __read(self, lines):
+        """return counters. return None if offsets are not valid for lines."""
+        if self.offsets is None:
+            return None
+
+        counters = []
+        for name, offset in zip(self.FIELDS, self.offsets):
+            if offset is None:
+                counters.append(0)
+                continue
+
+            if offset >= len(lines):
+                return None
+            key, _, value = lines[offset].partition(" ")
+            if key != name:
+                return None
+            counters.append(int(value))
+
+        return counters
+
+#--------------------
+# Tcp
+#--------------------
+
+
+class Tcp(object):
+
+    """TCP health. retransmits, opens and listen overflows and drops are per second.
+    retransPercent is retransmitted segments in percent of sent segments.
+    the others are numbers of sockets now.
+    """
+
+    def __init__(self, retrans=0.0, retrans_percent=0.0, active_opens=0.0, passive_opens=0.0, listen_overflows=0.0, listen_drops=0.0,
+                 established=0, inuse=0, orphan=0, timewait=0):
+        self.update(retrans, retrans_percent, active_opens, passive_opens, listen_overflows, listen_drops, established, inuse, orphan, timewait)
+
+    def update(self, retrans, retrans_percent, active_opens, passive_opens, listen_overflows, listen_drops, established, inuse, orphan, timewait):
+        self.retransRate = Rate(retrans)
+        self.retransPercent = retrans_percent
+        self.activeOpenRate = Rate(active_opens)
+        self.passiveOpenRate = Rate(passive_opens)
+        self.listenOverflowRate = Rate(listen_overflows)
+        self.listenDropRate = Rate(listen_drops)
+        self.established = established
+        self.inuse = inuse
+        self.orphan = orphan
+        self.timewait = timewait
+
+    def values(self):
+        return (self.retransRate.real, self.retransPercent, self.activeOpenRate.real, self.passiveOpenRate.real, self.listenOverflowRate.real,
+                self.listenDropRate.real, self.established, self.inuse, self.orphan, self.timewait)
+
+    def __str__(self):
+        return "%s/s %.1f%%" % (self.retransRate, self.retransPercent)
+
+#--------------------
+# CounterTable
+#--------------------
+
+
+class CounterTable(object):
+
+    """chosen counters of a section of /proc/net/snmp or /proc/net/netstat.
+    a section is a line of names and a line of values, like this.
+        Tcp: RtoAlgorithm RtoMin ... ActiveOpens PassiveOpens ...
+        Tcp: 1 200 ... 6 5 ...
+    columns of the names are found once, and found again only if the line of names changes.
+    """
+
+    def __init__(self, path, section, names):
+        self.file = ProcFile(path)
+        self.section = section + ":"
+        self.names = names
+        self.header = None
+        self.columns = None
+
+    def read(self):
+        """return values of names. missing counters are 0. return None if file can not be read."""
+        content = self.file.read()
+        if content is None:
+            return None
+
+        start = content.find(self.section)
+        if start < 0:
+            return None
+        header_end = content.find("\n", start)
+        values_end = content.find("\n", header_end + 1)
+
+        header = content[start:header_end]
+        if header != self.header:
+            names = header.split()
+            self.columns = [names.index(name) if name in names else None for name in self.names]
+            self.header = header
+
+        values = content[header_end + 1:values_end if values_end >= 0 else None].split()
+        return [int(values[column]) if column is not None and column < len(values) else 0 for column in self.columns]
+
+#--------------------
+# TcpReader
+#--------------------
+
+
+class TcpReader(object):
+
+    """read Tcp from /proc/net/snmp, /proc/net/netstat and /proc/net/sockstat."""
+
+    SNMP_COUNTERS = ("RetransSegs", "OutSegs", "ActiveOpens", "PassiveOpens", "CurrEstab")
+    NETSTAT_COUNTERS = ("ListenOverflows", "ListenDrops")
+
+    # TCP: inuse 4 orphan 0 tw 0 alloc 4 mem 0
+    SOCKSTAT_FIELDS = ("inuse", "orphan", "tw")
+
+    def __init__(self):
+        self.snmp = CounterTable(os.path.join(PROC_ROOT, "net", "snmp"), "Tcp", self.SNMP_COUNTERS)
+        self.netstat = CounterTable(os.path.join(PROC_ROOT, "net", "netstat"), "TcpExt", self.NETSTAT_COUNTERS)
+        self.sockstat = ProcFile(os.path.join(PROC_ROOT, "net", "sockstat"))
+        self.last = None
+
+    def update(self, tcp, now):
+        snmp = self.snmp.read()
+        if snmp is None:
+            return
+        netstat = self.netstat.read() or [0] * len(self.NETSTAT_COUNTERS)
+
+        retrans, out_segs, active_opens, passive_opens, established = snmp
+        counters = (retrans, out_segs, active_opens, passive_opens) + tuple(netstat)
+
+        rates = [0.0] * len(counters)
+        if self.last:
+            last_time, last_counters = self.last
+            elapsed = now - last_time
+            if elapsed > 0:
+                rates = [(c - last) / elapsed for c, last in zip(counters, last_counters)]
+        self.last = (now, counters)
+
+        retrans_rate, out_rate = rates[0], rates[1]
+        retrans_percent = 100.0 * retrans_rate / out_rate if out_rate > 0 else 0.0
+
+        tcp.update(retrans_rate, retrans_percent, rates[2], rates[3], rates[4], rates[5], established, *self.__read_sockstat())
+
+    def __read_sockstat(self):
+        content = self.sockstat.read() or ""
+        start = content.find("TCP:")
+        fields = content[start:content.find("\n", start)].split() if start >= 0 else []
+
+        return [int(fields[fields.index(name) + 1]) if name in fields else 0 for name in self.SOCKSTAT_FIELDS]
+
+#--------------------
+# Pressure
+#--------------------
+
+
+class Pressure(object):
+
+    """Pressure Stall Information of one resource.
+    some is share of time at least one task stalled, full is share of time all non-idle tasks stalled.
+    somePercent and fullPercent are rates from total counters, someAvg10 and fullAvg10 are kernel's averages.
+    """
+
+    def __init__(self, some=0.0, full=0.0):
+        self.update(some, full)
+
+    def update(self, some, full, some_avg10=0.0, full_avg10=0.0):
+        self.somePercent = Percent(some)
+        self.fullPercent = Percent(full)
+        self.someAvg10 = some_avg10
+        self.fullAvg10 = full_avg10
+
+    def values(self):
+        return (self.somePercent.percent, self.fullPercent.percent)
+
+    def __str__(self):
+        return "%.2f/%.2f %s" % (self.someAvg10, self.fullAvg10, self.somePercent)
+
+#--------------------
+# PressureReader
+#--------------------
+
+
+class PressureReader(object):
+
+    """read /proc/pressure/<kind> and update Pressure.
+
+    /proc/pressure/<kind> is like this.
+        some avg10=0.00 avg60=0.00 avg300=0.00 total=123456
+        full avg10=0.00 avg60=0.00 avg300=0.00 total=12345
+    """
+
+    def __init__(self, kind):
+        self.file = ProcFile(os.path.join(PROC_ROOT, "pressure", kind))
+        self.last = None
+
+    def update(self, pressure, now):
+        content = self.file.read()
+        if content is None:
+            return
+
+        avg10 = {"some": 0.0, "full": 0.0}
+        total = {"some": 0, "full": 0}
+        for line in content.splitlines():
+            fields = line.split()
+            if not fields or fields[0] not in avg10:
+                continue
+
+            for field in fields[1:]:
+                key, value = field.split("=")
+                if key == "avg10":
+                    avg10[fields[0]] = float(value)
+                elif key == "total":
+                    total[fields[0]] = int(value)
+
+        some, full = 0.0, 0.0
+        if self.last:
+            last_time, last_total = self.last
+            elapsed = (now - last_time) * 1000000  # total is microseconds.
+            if elapsed > 0:
+                some = min(100.0, (total["some"] - last_total["some"]) * 100.0 / elapsed)
+                full = min(100.0, (total["full"] - last_total["full"]) * 100.0 / elapsed)
+
+        self.last = (now, total)
+        pressure.update(some, full, avg10["some"], avg10["full"])
+
+#--------------------
+# PressureSet
+#--------------------
+
+
+class PressureSet(object):
+
+    """Pressure of CPU, memory and IO."""
+
+    KINDS = ("cpu", "memory", "io")
+
+    # False if kernel doesn't support PSI or it is disabled.
+    AVAILABLE = readable(os.path.join(PROC_ROOT, "pressure", "cpu"))
+
+    def __init__(self, cpu=0.0, memory=0.0, io=0.0):
+        self.cpu = Pressure(cpu)
+        self.memory = Pressure(memory)
+        self.io = Pressure(io)
+
+    def values(self):
+        return (self.cpu.somePercent.percent, self.memory.somePercent.percent, self.io.somePercent.percent)
+
+#--------------------
+# RunQueue
+#--------------------
+
+
+class RunQueue(object):
+
+    """run queue latency from /proc/schedstat.
+    wait is seconds runnable tasks waited for a CPU per second, 1.0 means one task was always waiting.
+    sliceRate is timeslices run per second.
+    """
+
+    # False if kernel is built without CONFIG_SCHEDSTATS.
+    AVAILABLE = readable(os.path.join(PROC_ROOT, "schedstat"))
+
+    def __init__(self, wait=0.0, slices=0.0):
+        self.update(wait, slices)
+
+    def update(self, wait, slices):
+        self.wait = wait
+        self.sliceRate = Rate(slices)
+
+    def values(self):
+        return (self.wait, self.sliceRate.real)
+
+    def __str__(self):
+        """
+        >>> print(RunQueue(0.0123))
+        12ms/s
+        >>> print(RunQueue(2.5))
+        2.5s/s
+        """
+        if self.wait >= 1:
+            return "%.1fs/s" % self.wait
+
+        return "%dms/s" % round(self.wait * 1000)
+
+#--------------------
+# SchedstatReader
+#--------------------
+import re
+
+
+class SchedstatReader(object):
+
+    """read run queue wait time and timeslices of each CPU from /proc/schedstat.
+    cpu lines are picked by one regular expression, so domain lines, which are most of the file on many cores, are never split.
+    the last two fields of a cpu line are wait time(nanoseconds) and timeslices since boot.
+        cpu0 0 0 4753416 1283349 2538187 1553414 2152312455683 94872617125 3411598
+    """
+
+    # cpu lines always follow the version line. the literal prefix lets the regular expression skip to "\ncpu" quickly.
+    CPU_LINE = re.compile(r"\ncpu(\d+) .* (\d+) (\d+)")
+
+    def __init__(self):
+        self.file = ProcFile(os.path.join(PROC_ROOT, "schedstat"))
+        self.last = None
+
+    def update(self, runqueue, each_runqueue, now):
+        content = self.file.read()
+        if content is None:
+            return
+
+        counters = dict((int(cpu), (int(wait), int(slices))) for cpu, wait, slices in self.CPU_LINE.findall(content))
+
+        if self.last:
+            last_time, last_counters = self.last
+            elapsed = now - last_time
+            if elapsed > 0:
+                self.__update(runqueue, each_runqueue, counters, last_counters, elapsed)
+
+        self.last = (now, counters)
+
+    def __update(self, runqueue, each_runqueue, counters, last_counters, elapsed):
+        total_wait = total_slices = 0.0
+        for cpu, (wait, slices) in counters.items():
+            # CPUs which came online since the last read have no difference.
+            if cpu not in last_counters:
+                continue
+
+            last_wait, last_slices = last_counters[cpu]
+            wait = (wait - last_wait) / 1e9 / elapsed
+            slices = (slices - last_slices) / elapsed
+            if cpu < len(each_runqueue):
+                each_runqueue[cpu].update(wait, slices)
+
+            total_wait += wait
+            total_slices += slices
+
+        runqueue.update(total_wait, total_slices)
+
+#--------------------
+# CPUSensorReader
+#--------------------
+import glob
+
+
+class CPUSensorReader(object):
+
+    """read frequency, temperature and thermal throttle count of each CPU from sysfs.
+    files are searched once and kept open.
+    """
+
+    # hwmon drivers of CPU temperature.
+    HWMON_NAMES = ("coretemp", "k10temp", "zenpower")
+
+    def __init__(self, num_cpus):
+        cpu_dir = os.path.join(SYS_ROOT, "devices", "system", "cpu")
+        cpus = ["cpu%d" % i for i in range(num_cpus)]
+
+        self.freq_files = [self.__open(cpu_dir, cpu, "cpufreq", "scaling_cur_freq") for cpu in cpus]
+        self.throttle_files = [self.__open(cpu_dir, cpu, "thermal_throttle", "core_throttle_count") for cpu in cpus]
+        self.throttle_counts = [None] * num_cpus
+
+        topology = [(read_text(os.path.join(cpu_dir, cpu, "topology", "physical_package_id")),
+                     read_text(os.path.join(cpu_dir, cpu, "topology", "core_id"))) for cpu in cpus]
+        core_files, package_files = self.__find_temperatures()
+        self.package_files = list(package_files.values())
+        self.temp_files = [core_files.get(t) or package_files.get(t[0]) for t in topology]
+
+    def __open(self, *paths):
+        path = os.path.join(*paths)
+        return ProcFile(path) if os.path.exists(path) else None
+
+    def __find_temperatures(self):
+        """return ({(package id, core id): file}, {package id: file}). ids are strings of topology."""
+        core_files = {}
+        package_files = {}
+
+        for hwmon in sorted(glob.glob(os.path.join(SYS_ROOT, "class", "hwmon", "hwmon*"))):
+            if read_text(os.path.join(hwmon, "name")) not in self.HWMON_NAMES:
+                continue
+
+            # k10temp has no package id, it is one hwmon per package.
+            package_id = str(len(package_files))
+            cores = {}
+            for label_path in glob.glob(os.path.join(hwmon, "temp*_label")):
+                label = read_text(label_path) or ""
+                temp_file = ProcFile(label_path.replace("_label", "_input"))
+
+                if label.startswith("Package id"):
+                    package_id = label.split()[-1]
+                    package_files[package_id] = temp_file
+                elif label.startswith("Core"):
+                    cores[label.split()[-1]] = temp_file
+                elif label in ("Tctl", "Tdie"):
+                    package_files[package_id] = temp_file
+
+            for core_id, temp_file in cores.items():
+                core_files[(package_id, core_id)] = temp_file
+
+        if not package_files:
+            for zone in sorted(glob.glob(os.path.join(SYS_ROOT, "class", "thermal", "thermal_zone*"))):
+                zone_type = read_text(os.path.join(zone, "type")) or ""
+                if zone_type == "x86_pkg_temp" or "cpu" in zone_type:
+                    package_files["0"] = ProcFile(os.path.join(zone, "temp"))
+                    break
+
+        return core_files, package_files
+
+    def __read_number(self, f, unit):
+        content = f.read() if f else None
+        try:
+            return int(content) / unit if content else None
+        except ValueError:
+            return None
+
+    def update(self, cpu, each_cpu):
+        for i, c in enumerate(each_cpu):
+            c.freq = self.__read_number(self.freq_files[i], 1000.0)  # kHz
+            c.temp = self.__read_number(self.temp_files[i], 1000.0)  # millidegree Celsius
+
+            count = self.__read_number(self.throttle_files[i], 1)
+            c.throttled = None not in (count, self.throttle_counts[i]) and count > self.throttle_counts[i]
+            self.throttle_counts[i] = count
+
+        freqs = [c.freq for c in each_cpu if c.freq is not None]
+        temps = [self.__read_number(f, 1000.0) for f in self.package_files] or [c.temp for c in each_cpu]
+        temps = [t for t in temps if t is not None]
+
+        cpu.freq = sum(freqs) / len(freqs) if freqs else None
+        cpu.temp = max(temps) if temps else None
+        cpu.throttled = any(c.throttled for c in each_cpu)
+
+#--------------------
+# InterruptTable
+#--------------------
+
+
+class InterruptTable(object):
+
+    """counters of each CPU in /proc/interrupts or /proc/softirqs.
+    the file is read into a preallocated buffer, and only lines changed since last read are parsed.
+
+    /proc/interrupts is like this.
+                   CPU0       CPU1
+          0:         33          0   IO-APIC   2-edge      timer
+        NMI:          0          0   Non-maskable interrupts
+    """
+
+    BUFFER_SIZE = 64 * 1024
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.buffer = bytearray(self.BUFFER_SIZE)
+        self.view = memoryview(self.buffer)
+
+        self.header = None
+        self.columns = 0
+        self.lines = []
+        self.counts = {}
+        self.descriptions = {}
+
+    def __read(self):
+        """read file into buffer and return size of content, or 0. buffer is grown if content doesn't fit."""
+        try:
+            if self.file is None:
+                self.file = open(self.path, "rb", 0)
+
+            self.file.seek(0)
+            size = 0
+            while True:
+                if size == len(self.buffer):
+                    # a bytearray can't be resized while a memoryview of it exists.
+                    self.view = None
+                    self.buffer.extend(bytearray(len(self.buffer)))
+                    self.view = memoryview(self.buffer)
+
+                n = self.file.readinto(self.view[size:])
+                if not n:
+                    return size
+                size += n
+        except (IOError, OSError):
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+            return 0
+
+    def __lines(self, size):
+        """return lines of content in buffer. each line is copied once, content is not copied as a whole."""
+        lines = []
+        start = 0
+        while start < size:
+            end = self.buffer.find(b"\n", start, size)
+            if end < 0:
+                end = size
+            lines.append(bytes(self.buffer[start:end]))
+            start = end + 1
+
+        return lines
+
+    def update(self):
+        """return list of (name, list of counter deltas of each CPU) of lines changed since last read."""
+        lines = self.__lines(self.__read())
+        if not lines:
+            return []
+
+        if lines[0] != self.header:
+            self.header = lines[0]
+            self.columns = len(self.header.split())
+            self.lines = []
+            self.counts = {}
+
+        changed = []
+        for i, line in enumerate(lines[1:]):
+            if i < len(self.lines) and self.lines[i] == line:
+                continue
+
+            fields = line.split()
+            if not fields:
+                continue
+
+            name = fields[0].rstrip(b":").decode()
+            counts = array("L", [int(f) for f in fields[1:1 + self.columns] if f.isdigit()])
+            self.descriptions[name] = b" ".join(fields[1 + len(counts):]).decode("ascii", "replace")
+
+            last_counts = self.counts.get(name)
+            if last_counts is not None and len(last_counts) == len(counts):
+                changed.append((name, list(map(operator.sub, counts, last_counts))))
+            self.counts[name] = counts
+
+        self.lines = lines[1:]
+        return changed
+
+#--------------------
+# Interrupts
+#--------------------
+
+
+class Interrupts(object):
+
+    """hottest IRQ sources and softirq rates.
+    top_irqs is list of (irq name, description, Rate, index of hottest CPU, share of hottest CPU).
+    softirqs is list of (softirq name, Rate, index of hottest CPU, Rate of hottest CPU).
+    """
+
+    def __init__(self):
+        self.top_irqs = []
+        self.softirqs = []
+
+#--------------------
+# InterruptsReader
+#--------------------
+
+
+class InterruptsReader(object):
+
+    # number of IRQ sources in Interrupts.top_irqs.
+    TOP = 4
+
+    def __init__(self):
+        self.irq_table = InterruptTable(os.path.join(PROC_ROOT, "interrupts"))
+        self.softirq_table = InterruptTable(os.path.join(PROC_ROOT, "softirqs"))
+        self.last_time = None
+
+    def update(self, interrupts, now):
+        irq_changes = self.irq_table.update()
+        softirq_changes = self.softirq_table.update()
+
+        elapsed = now - self.last_time if self.last_time else 0.0
+        self.last_time = now
+        if elapsed <= 0:
+            return
+
+        irqs = [(sum(deltas), name, deltas) for name, deltas in irq_changes]
+        interrupts.top_irqs = []
+        for total, name, deltas in heapq.nlargest(self.TOP, irqs):
+            if not deltas:
+                continue
+
+            hottest = deltas.index(max(deltas))
+            # numbered IRQ ends with device name, others like "LOC" have only description.
+            description = self.irq_table.descriptions.get(name, "")
+            if name.isdigit() and description:
+                description = description.split()[-1]
+            interrupts.top_irqs.append((name, description, Rate(total / elapsed),
+                                        hottest, Percent(100.0 * deltas[hottest] / total) if total else Percent(0.0)))
+
+        softirqs = []
+        for name, deltas in softirq_changes:
+            if not deltas:
+                continue
+
+            hottest = deltas.index(max(deltas))
+            softirqs.append((name, Rate(sum(deltas) / elapsed), hottest, Rate(deltas[hottest] / elapsed)))
+        interrupts.softirqs = sorted(softirqs, key=lambda softirq: -softirq[1])
+
+#--------------------
+# Filesystem
+#--------------------
+
+# filesystems which don't have storage.
+PSEUDO_FILESYSTEMS = ("proc", "sysfs", "devtmpfs", "devpts", "tmpfs", "cgroup", "cgroup2", "securityfs", "pstore",
+                      "debugfs", "tracefs", "configfs", "mqueue", "hugetlbfs", "autofs", "bpf", "binfmt_misc",
+                      "fusectl", "rpc_pipefs", "nsfs", "ramfs", "squashfs", "overlay", "efivarfs", "selinuxfs")
+
+
+def storage_mountpoints():
+    """return mount points of filesystems which have storage, including network and FUSE filesystems.
+    mounts are listed from mount table, so hung mounts don't block.
+    """
+    mountpoints = []
+    try:
+        partitions = psutil.disk_partitions(all=True)
+    except (IOError, OSError):
+        return mountpoints
+
+    for partition in partitions:
+        if partition.fstype in PSEUDO_FILESYSTEMS or partition.mountpoint in mountpoints:
+            continue
+        if partition.mountpoint.startswith(("/proc", "/sys", "/dev", "/run")):
+            continue
+        mountpoints.append(partition.mountpoint)
+
+    return mountpoints
+
+
+class Filesystem(object):
+
+    """usage of a mounted filesystem.
+    stale is True while the latest statvfs hasn't returned in time, values are the last known ones then.
+    """
+
+    MOUNTPOINTS = storage_mountpoints()
+
+    def __init__(self, mountpoint="", total=1, used=0, inodes_total=1, inodes_used=0):
+        self.mountpoint = mountpoint
+        self.stale = False
+        self.update(total, used, inodes_total, inodes_used)
+
+    def update(self, total, used, inodes_total, inodes_used):
+        self.total = Bytes(total)
+        self.used = Bytes(used)
+        self.percent = Percent((1.0 * used / total) * 100) if total else Percent(0.0)
+        self.inodesPercent = Percent((1.0 * inodes_used / inodes_total) * 100) if inodes_total else Percent(0.0)
+
+    def __str__(self):
+        return "%s %s/%s %s i%s" % (self.mountpoint, self.used, self.total, self.percent, self.inodesPercent)
+
+#--------------------
+# FilesystemProber
+#--------------------
+
+
+class FilesystemProber(object):
+
+    """statvfs of filesystems in a small pool of worker threads.
+    update never waits for them. a probe which fails or doesn't return in TIMEOUT marks the filesystem stale,
+    and a stale filesystem is probed again after exponential back off.
+    a hung probe is never submitted again until it returns. its worker leaves the pool and a new worker replaces it,
+    so hung mounts never starve the others.
+    """
+
+    WORKERS = 4
+    TIMEOUT = 2.0
+    MAX_BACKOFF = 300.0
+
+    # status of a filesystem. None means idle.
+    QUEUED = "queued"
+    RUNNING = "running"
+    HUNG = "hung"
+
+    def __init__(self, filesystems):
+        self.filesystems = filesystems
+        self.queue = Queue()
+        self.lock = threading.Lock()
+        self.pid = None
+
+        # mountpoint: [status, time when statvfs started, time of next probe, back off seconds]
+        self.states = dict((fs.mountpoint, [None, None, 0.0, 0.0]) for fs in filesystems)
+
+    def __start_worker(self):
+        worker = threading.Thread(target=self.__work)
+        worker.daemon = True
+        worker.start()
+
+    def update(self, now):
+        # threads don't survive fork, they are started in the process which probes.
+        if self.pid != os.getpid():
+            self.pid = os.getpid()
+            for i in range(min(self.WORKERS, len(self.filesystems))):
+                self.__start_worker()
+
+        with self.lock:
+            for fs in self.filesystems:
+                state = self.states[fs.mountpoint]
+                status, started, next_time = state[:3]
+
+                # back off grows when the probe returns.
+                if status == self.RUNNING and now - started > self.TIMEOUT:
+                    state[0] = self.HUNG
+                    fs.stale = True
+                    self.__start_worker()
+                elif status is None and now >= next_time:
+                    state[0] = self.QUEUED
+                    self.queue.put(fs)
+
+    def __work(self):
+        while True:
+            fs = self.queue.get()
+            with self.lock:
+                state = self.states[fs.mountpoint]
+                state[0], state[1] = self.RUNNING, time.time()
+
+            try:
+                st = os.statvfs(fs.mountpoint)
+            except (IOError, OSError):
+                st = None
+
+            with self.lock:
+                hung = state[0] == self.HUNG
+                late = time.time() - state[1] > self.TIMEOUT
+                state[0] = None
+
+                if st is not None:
+                    fs.update(st.f_blocks * st.f_frsize, (st.f_blocks - st.f_bfree) * st.f_frsize,
+                              st.f_files, st.f_files - st.f_ffree)
+
+                fs.stale = st is None or late
+                state[3] = min(max(state[3] * 2, self.TIMEOUT), self.MAX_BACKOFF) if fs.stale else 0.0
+                state[2] = time.time() + state[3]
+
+            # this worker has been replaced while it hung.
+            if hung:
+                return
+
+#--------------------
+# WindowQuantile
+#--------------------
+
+
+class WindowQuantile(object):
+
+    """streaming percentiles of samples of a ratio (0.0 - 1.0) in the latest seconds.
+    samples are counted in fixed bins and kept in SLICES time slices of the window, the oldest slice expires at once.
+    so push is O(1) amortized whatever the interval is, and memory is 1 byte per sample in window.
+
+    >>> q = WindowQuantile(200)
+    >>> for i in range(101):
+    ...     q.push(i / 100.0, i)
+    >>> print(q.percentiles().p50)
+    50%
+    >>> q.push(1.0, 250)
+    >>> q.size
+    42
+    """
+
+    BINS = 200
+    SLICES = 20
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.slice_seconds = float(seconds) / self.SLICES
+
+        # (index of slice, bins of samples), oldest first. the latest slice is current.
+        self.slices = collections.deque()
+        self.index = None
+        self.current = None
+        self.counts = [0] * (self.BINS + 1)
+        self.size = 0
+
+    def push(self, ratio, now):
+        b = int(round(min(max(ratio, 0.0), 1.0) * self.BINS))
+
+        index = int(now / self.slice_seconds)
+        if index != self.index:
+            self.__expire(index)
+            self.index, self.current = index, array("B")
+            self.slices.append((index, self.current))
+
+        self.current.append(b)
+        self.counts[b] += 1
+        self.size += 1
+
+    def __expire(self, index):
+        while self.slices and self.slices[0][0] <= index - self.SLICES:
+            for b in self.slices.popleft()[1]:
+                self.counts[b] -= 1
+                self.size -= 1
+
+    def percentiles(self):
+        return Percentiles(*self.quantiles(Percentiles.QUANTILES))
+
+    def quantiles(self, qs):
+        """return values of sorted quantiles qs in one pass of the bins."""
+        results = []
+        if not self.size:
+            return [0.0 for q in qs]
+
+        ranks = [q * (self.size - 1) for q in qs]
+        cumulative = 0
+        for b, count in enumerate(self.counts):
+            cumulative += count
+            while len(results) < len(ranks) and cumulative > ranks[len(results)]:
+                results.append(100.0 * b / self.BINS)
+
+        return results
+
+#--------------------
+# Percentiles
+#--------------------
+
+
+class Percentiles(object):
+
+    QUANTILES = (0.5, 0.95, 0.99, 1.0)
+
+    def __init__(self, p50=0.0, p95=0.0, p99=0.0, maximum=0.0):
+        self.p50 = Percent(p50)
+        self.p95 = Percent(p95)
+        self.p99 = Percent(p99)
+        self.max = Percent(maximum)
+
+    def __str__(self):
+        return "p50 %s p95 %s p99 %s max %s" % (self.p50, self.p95, self.p99, self.max)
+
+#--------------------
+# Rollup
+#--------------------
+
+
+class Rollup(object):
+
+    """min, mean and max of the resources sampled in one step of a HistoryTier."""
+
+    def __init__(self, resource_class, minimum=None, mean=None, maximum=None):
+        self.min = resource_class(*minimum) if minimum else resource_class()
+        self.mean = resource_class(*mean) if mean else resource_class()
+        self.max = resource_class(*maximum) if maximum else resource_class()
+
+#--------------------
+# HistoryTier
+#--------------------
+
+
+class HistoryTier(object):
+
+    """fixed size history of one resolution.
+    if step is 0, every pushed sample is kept as it is.
+    otherwise samples are rolled up into min, mean and max per step seconds.
+    """
+
+    def __init__(self, name, step, capacity):
+        self.name = name
+        self.step = step
+        self.entries = collections.deque(maxlen=capacity)
+
+        self._bucket = None
+        self._reset()
+
+    def push(self, values, now):
+        if not self.step:
+            self.entries.append((values, values, values))
+            return
+
+        bucket = int(now // self.step)
+        if bucket != self._bucket:
+            self._close()
+            self._bucket = bucket
+
+        self._count += 1
+        if self._sum is None:
+            self._sum = list(values)
+            self._min = list(values)
+            self._max = list(values)
+        else:
+            for i, v in enumerate(values):
+                self._sum[i] += v
+                if v < self._min[i]:
+                    self._min[i] = v
+                if v > self._max[i]:
+                    self._max[i] = v
+
+    def latest(self, length):
+        """return latest entries including the step not closed yet."""
+        entries = list(self.entries)
+        if self._count:
+            entries.append(self._current())
+        return entries[-length:] if length > 0 else []
+
+    def _current(self):
+        mean = [1.0 * v / self._count for v in self._sum]
+        return (tuple(self._min), tuple(mean), tuple(self._max))
+
+    def _close(self):
+        if self._count:
+            self.entries.append(self._current())
+        self._reset()
+
+    def _reset(self):
+        self._count = 0
+        self._sum = None
+        self._min = None
+        self._max = None
+
 #--------------------
 # ResourceHistory
 #--------------------
@@ -163,27 +1481,90 @@ class Procs(object):
 
 class ResourceHistory(object):
 
-    def __init__(self, resource_class):
-        self.resource_class = resource_class
-        self.resources = []
+    """history of a resource in several resolutions with fixed memory."""
+
+    # (name, seconds per step, number of steps)
+    TIERS = (
+        ("raw", 0, 1024),
+        ("10s", 10, 360),  # 1 hour
+        ("1m", 60, 1440),  # 1 day
+        ("10m", 600, 1008),  # 1 week
+    )
+
+    def __init__(self, resource, tiers=TIERS):
+        self.resource = resource
+        self.resource_class = resource.__class__
+        self.tiers = [HistoryTier(name, step, capacity) for name, step, capacity in tiers]
+
+    def record(self, now):
+        values = self.resource.values()
+        for tier in self.tiers:
+            tier.push(values, now)
+
+    def get(self, tier_index, length):
+        """return list of Rollup. blank rollups are padded at the head up to length."""
+        entries = self.tiers[tier_index].latest(length)
+        rollups = [Rollup(self.resource_class) for i in range(length - len(entries))]
+        rollups += [Rollup(self.resource_class, *entry) for entry in entries]
+        return rollups
+
+#--------------------
+# Collector
+#--------------------
+
 
-    def get(self, index):
-        return self.resources[index]
+class Collector(object):
 
-    def pack(self, length):
-        res_len = len(self.resources)
-        if length < res_len:
-            del_len = res_len - length
-            del self.resources[:del_len]
-        elif length > res_len:
-            push_len = length - res_len
-            self.resources = [self.resource_class() for i in range(push_len)] + self.resources
+    """metric source of SystemStatus.
+    function(now) is run when cadence seconds have passed since the latest value.
+    cost is rough relative cost of a run, cheaper collectors run first.
+    """
+
+    # a collector is due a little before cadence, so it isn't skipped by jitter of ticks.
+    TOLERANCE = 0.9
+
+    def __init__(self, name, function, cadence=0.0, cost=1):
+        self.name = name
+        self.function = function
+        self.cadence = cadence
+        self.cost = cost
 
-    def push(self, resource, max_len):
-        self.resources.append(copy.copy(resource))
-        if len(self.resources) > max_len:
-            del_len = len(self.resources) - max_len
-            del self.resources[:del_len]
+        # time of the latest value. None means it has never run.
+        self.timestamp = None
+
+    def due(self, now):
+        return self.timestamp is None or now - self.timestamp >= self.cadence * self.TOLERANCE
+
+    def run(self, now):
+        self.function(now)
+        self.timestamp = now
+
+#--------------------
+# CollectorRegistry
+#--------------------
+
+
+class CollectorRegistry(object):
+
+    """collectors of SystemStatus. only collectors which are due are run on a tick."""
+
+    def __init__(self):
+        self.collectors = []
+
+    def register(self, name, function, cadence=0.0, cost=1):
+        self.collectors.append(Collector(name, function, cadence, cost))
+        self.collectors.sort(key=lambda collector: collector.cost)
+
+    def get(self, name):
+        for collector in self.collectors:
+            if collector.name == name:
+                return collector
+        return None
+
+    def run(self, now):
+        for collector in self.collectors:
+            if collector.due(now):
+                collector.run(now)
 
 #--------------------
 # SystemStatus
@@ -192,7 +1573,9 @@ class ResourceHistory(object):
 
 class SystemStatus(object):
 
-    """this class have system status, CPU percent, Memory percent, etc."""
+    """this class have system status, CPU percent, Memory percent, etc.
+    each metric is updated by its collector at its own cadence.
+    """
 
     def __init__(self):
         self.cpu = CPU()
@@ -202,42 +1585,302 @@ class SystemStatus(object):
         self.loadavg = LoadAverage()
         self.uptime = Uptime()
         self.procs = Procs()
+        self.scheduler = Scheduler()
+        self.paging = Paging()
+        self.tcp = Tcp()
+        self.pressure = PressureSet()
+        self.runqueue = RunQueue()
+        self.each_runqueue = [RunQueue() for i in range(CPU.NUM_CPUS)]
+        self.interrupts = Interrupts()
+        self.filesystems = []
+
+        # effective sampling interval. it is set by Updater when it is adaptive.
+        self.interval = None
+
+        self.histories = {}
+        self.__stats = []
+        self.__stat_reader = StatReader()
+        self.__meminfo_reader = MeminfoReader()
+        self.__sensor_reader = CPUSensorReader(CPU.NUM_CPUS)
+        self.__pressure_readers = [(PressureReader(kind), getattr(self.pressure, kind)) for kind in PressureSet.KINDS] if PressureSet.AVAILABLE else []
+        self.__schedstat_reader = SchedstatReader() if RunQueue.AVAILABLE else None
+
+        # cadence(second) 0 means every tick.
+        self.collectors = CollectorRegistry()
+        self.register("cpu", self.__update_cpu, 0.0, 2)
+        self.register("memory", self.__update_memory, 0.0, 1)
+        self.register("pressure", self.__update_pressure, 0.0, 1)
+        if self.__schedstat_reader:
+            self.register("runqueue", lambda now: self.__schedstat_reader.update(self.runqueue, self.each_runqueue, now), 0.0, 1)
+        self.register("uptime", lambda now: self.uptime.update(), 1.0, 1)
+        self.register("procs", lambda now: self.procs.update(), 2.0, 3)
+        # kernel updates load average every 5 seconds.
+        self.register("loadavg", lambda now: self.loadavg.update(), 5.0, 1)
+        self.register("sensors", lambda now: self.__sensor_reader.update(self.cpu, self.each_cpu), 5.0, 2)
+
+        # histories of stack layouts are recorded from the start, so switching layout shows them at once.
+        self.history("cpu")
+        self.history("memory")
+        if PressureSet.AVAILABLE:
+            self.history("pressure")
+
         self.update()
 
-    def update(self):
+    def register(self, name, function, cadence=0.0, cost=1):
+        """add metric source. function(now) is called when cadence seconds have passed."""
+        self.collectors.register(name, function, cadence, cost)
+
+    def timestamp(self, name):
+        """return time of the latest value of collector name, or None."""
+        collector = self.collectors.get(name)
+        return collector.timestamp if collector else None
+
+    def enable_stats(self, seconds):
+        """keep percentiles of latest seconds for CPU, each CPU and memory."""
+        self.__stats = [(cpu, "usedPercent") for cpu in [self.cpu] + self.each_cpu] + [(self.memory, "percent")]
+        for resource, name in self.__stats:
+            resource.stats = WindowQuantile(seconds)
+
+    def enable_interrupts(self):
+        """read /proc/interrupts and /proc/softirqs on every update."""
+        reader = InterruptsReader()
+        self.register("interrupts", lambda now: reader.update(self.interrupts, now), 0.0, 3)
+
+    def enable_paging(self):
+        """read /proc/vmstat on every update and record its history."""
+        reader = VmstatReader()
+        self.register("paging", lambda now: reader.update(self.paging, now), 0.0, 2)
+        self.history("paging")
+
+    def enable_tcp(self):
+        """read TCP counters and socket counts on every update."""
+        reader = TcpReader()
+        self.register("tcp", lambda now: reader.update(self.tcp, now), 0.0, 2)
+
+    def enable_filesystems(self):
+        """probe usage of Filesystem.MOUNTPOINTS in background."""
+        self.filesystems = [Filesystem(mountpoint) for mountpoint in Filesystem.MOUNTPOINTS]
+        prober = FilesystemProber(self.filesystems)
+        self.register("filesystems", prober.update, 2.0, 1)
+
+    def history(self, name):
+        """return ResourceHistory of attribute name. it is recorded on every update."""
+        if name not in self.histories:
+            self.histories[name] = ResourceHistory(getattr(self, name))
+        return self.histories[name]
+
+    def update(self, record=True):
+        """run collectors which are due. if record is False, statistics and histories are not recorded."""
+        now = time.time()
+        self.collectors.run(now)
+
+        if not record:
+            return
+
+        for resource, name in self.__stats:
+            resource.stats.push(getattr(resource, name), now)
+
+        for history in self.histories.values():
+            history.record(now)
+
+    def __update_cpu(self, now):
+        if self.__stat_reader.update(self.cpu, self.each_cpu, self.scheduler, now):
+            return
+
         times_percent = psutil.cpu_times_percent(percpu=True)
-        cpu = psutil.cpu_times_percent()
-        self.cpu.update(cpu.user, cpu.system, cpu.idle)
+        self.__update_cpu_by_tuple(self.cpu, psutil.cpu_times_percent())
 
         for i, c in enumerate(times_percent):
-            self.each_cpu[i].update(c.user, c.system, c.idle)
+            self.__update_cpu_by_tuple(self.each_cpu[i], c)
 
-        self.__update_memory(self.memory, psutil.virtual_memory())
-        self.__update_memory(self.swap, psutil.swap_memory())
+    def __update_cpu_by_tuple(self, cpu, tuple_cpu):
+        # fields other than user, system and idle depend on platform.
+        extra = [getattr(tuple_cpu, name, 0) for name in ("nice", "iowait", "irq", "softirq", "steal")]
+        guest = getattr(tuple_cpu, "guest", 0) + getattr(tuple_cpu, "guest_nice", 0)
+        cpu.update(tuple_cpu.user, tuple_cpu.system, tuple_cpu.idle, *(extra + [guest]))
 
-        self.loadavg.update()
-        self.uptime.update()
-        self.procs.update()
+    def __update_memory(self, now):
+        if not self.__meminfo_reader.update(self.memory, self.swap):
+            self.__update_memory_by_tuple(self.memory, psutil.virtual_memory())
+            self.__update_memory_by_tuple(self.swap, psutil.swap_memory())
 
-    def __update_memory(self, mem, tuple_mem):
+    def __update_memory_by_tuple(self, mem, tuple_mem):
         mem.update(tuple_mem.total, tuple_mem.used)
 
+    def __update_pressure(self, now):
+        for reader, pressure in self.__pressure_readers:
+            reader.update(pressure, now)
+
+#--------------------
+# Cadence
+#--------------------
+
+# CPU time of this process.
+process_time = getattr(time, "process_time", None) or (lambda: sum(os.times()[:2]))
+
+
+class Cadence(object):
+
+    """adaptive sampling interval within CPU budget.
+    interval is shortened while metrics change quickly and lengthened while system is idle,
+    but it never becomes shorter than cost per frame / budget.
+    """
+
+    # change of CPU and memory percent (0.0 - 1.0) between samples.
+    FAST_CHANGE = 0.10
+    IDLE_CHANGE = 0.02
+
+    # weight of the latest cost in moving average.
+    COST_WEIGHT = 0.2
+
+    def __init__(self, budget, interval):
+        self.budget = budget / 100.0
+        self.base_interval = interval
+        self.min_interval = interval / 4.0
+        self.max_interval = interval * 4.0
+
+        self.interval = interval
+        self.cost = None
+
+    def update(self, cost, change):
+        """return next interval from cost(second) of the last frame and change of metrics."""
+        if self.cost is None:
+            self.cost = cost
+        else:
+            self.cost += (cost - self.cost) * self.COST_WEIGHT
+
+        if change >= self.FAST_CHANGE:
+            interval = self.min_interval
+        elif change <= self.IDLE_CHANGE:
+            interval = self.interval * 1.25
+        else:
+            interval = self.base_interval
+
+        interval = min(max(interval, self.min_interval), self.max_interval)
+        self.interval = max(interval, self.cost / self.budget)
+
+        return self.interval
+
 #--------------------
 # Updater
 #--------------------
 
+import sys
+import struct
+import fcntl
+import termios
+
 
 class Updater(object):
 
-    def __init__(self, scr, system_status, interval, layout):
+    # seconds between visibility checks while hidden, screen is drawn soon after it is shown.
+    VISIBILITY_INTERVAL = 1.0
+    # seconds between visibility checks while visible. drawing a few seconds after hidden is harmless.
+    VISIBLE_CHECK_INTERVAL = 5.0
+
+    def __init__(self, scr, sampler, interval, layout, alerts=None, is_visible=None, budget=None, recorder=None):
+        """sampler is ttop.api.Sampler. it is driven by update, and layout draws its system_status."""
         self.scr = scr
-        self.system_status = system_status
+        self.sampler = sampler
+        self.system_status = sampler.system_status
         self.interval = interval
         self.layout = layout
+        self.alerts = alerts
+
+        # FlightRecorder. while it is bursting, samples between regular updates are taken only for it.
+        self.recorder = recorder
+        self.__update_time = 0.0
+
+        # if budget(percent of one core) is given, interval is adapted by Cadence.
+        self.cadence = Cadence(budget, interval) if budget else None
+        self.__last_values = None
+
+        # function returns False while the screen is not seen. None means always visible.
+        self.is_visible = is_visible
+        self.visible = True
+        self.__visibility_time = 0.0
 
     def update(self):
-        self.system_status.update()
+        """sample system status. screen is drawn only while it is visible."""
+        start = process_time()
+        now = time.time()
+
+        bursting = self.recorder and self.recorder.bursting
+        regular = not bursting or now - self.__update_time >= self.interval - self.recorder.BURST_INTERVAL / 2
+
+        snapshot = self.sampler.sample(regular)
+        if self.recorder:
+            self.recorder.record(self.system_status, snapshot)
+        if not regular:
+            return
+
+        self.__update_time = now
+        if self.alerts:
+            self.alerts.evaluate(self.system_status, now)
+
+        self.check_visibility()
+        if self.visible:
+            self.draw()
+
+        if self.cadence:
+            self.__adapt_interval(process_time() - start)
+
+    def wait_interval(self):
+        """return seconds until next update. it is short while flight recorder is bursting."""
+        if self.recorder and self.recorder.bursting:
+            return min(self.interval, self.recorder.BURST_INTERVAL)
+
+        return self.interval
+
+    def __adapt_interval(self, cost):
+        values = (self.system_status.cpu.usedPercent, self.system_status.memory.percent)
+        change = sum(abs(v - last) for v, last in zip(values, self.__last_values)) if self.__last_values else 0.0
+        self.__last_values = values
+
+        self.interval = self.cadence.update(cost, change)
+        self.system_status.interval = self.interval
+
+    def resize(self):
+        """fit screen to resized terminal. update process never reads keys, so curses doesn't notice it by itself."""
+        try:
+            size = fcntl.ioctl(sys.stdout.fileno(), termios.TIOCGWINSZ, b"\0" * 8)
+        except (IOError, OSError):
+            return
+
+        lines, columns = struct.unpack("hhhh", size)[:2]
+
+        # ansi screen resizes itself.
+        getattr(self.scr, "resizeterm", curses.resizeterm)(lines, columns)
+
+    def set_layout(self, layout):
+        """replace layout. histories are kept in system_status, so they are carried over."""
+        layout.follow(self.layout)
+        self.layout = layout
+
+    def set_interval(self, interval):
+        """change interval. if budget is given, interval is adapted around the new one."""
+        self.interval = interval
+        self.system_status.interval = interval
+
+        if self.cadence:
+            self.cadence = Cadence(self.cadence.budget * 100, interval)
+
+    def check_visibility(self):
+        """update visible at most once per VISIBILITY_INTERVAL while hidden, and once per VISIBLE_CHECK_INTERVAL while visible.
+        return True if screen has been shown now.
+        """
+        now = time.time()
+        interval = self.VISIBLE_CHECK_INTERVAL if self.visible else self.VISIBILITY_INTERVAL
+        if not self.is_visible or now - self.__visibility_time < interval:
+            return False
+
+        self.__visibility_time = now
+        hidden = not self.visible
+        self.visible = self.is_visible()
+
+        return hidden and self.visible
 
+    def draw(self):
         try:
             self.scr.erase()
             self.layout.draw()
@@ -263,6 +1906,17 @@ class Arguments(object):
         self.stack = arg["stack"]
         self.horizontal = arg["horizontal"]
         self.vertical = arg["vertical"]
+        self.status = arg["status"]
+        self.width = int(arg["--width"])
+        self.show = arg["--show"].split(",") if arg["--show"] else []
+        self.stats_window = float(arg["--stats-window"])
+        self.alert = arg["--alert"]
+        self.notify = arg["--notify"].split(",") if arg["--notify"] else []
+        self.budget = float(arg["--budget"]) if arg["--budget"] else None
+        self.record = arg["--record"]
+        self.burst = float(arg["--burst"])
+        self.record_dir = arg["--record-dir"]
+        self.backend = arg["--backend"]
 
         # default view is "normal".
         if not self.normal and not self.minimal and not self.stack:
@@ -0,0 +1,115 @@
+import os
+import json
+import time
+import collections
+
+import psutil
+
+from ttop import alert
+
+#=======================================
+# Flight recorder
+#=======================================
+
+#--------------------
+# FlightRecorder
+#--------------------
+
+
+class FlightRecorder(object):
+
+    """keep latest samples in a ring, and dump it when a rule fires.
+
+    every sample is put into the ring, so a dump has CAPACITY samples before and after the trigger.
+    after the trigger, samples are taken every BURST_INTERVAL for duration seconds,
+    and the dump is written when the burst ends with the top processes by CPU during the burst.
+
+    a dump is JSON lines. the first line is the trigger, the last line is processes, and samples are between them.
+    """
+
+    # samples in the ring. 600 samples are a minute of burst, or 10 minutes of 1 second interval.
+    CAPACITY = 600
+
+    BURST_INTERVAL = 0.1
+
+    # processes in the snapshot, ordered by CPU percent.
+    TOP_PROCESSES = 20
+
+    def __init__(self, rules, duration, directory=".", notify=None):
+        self.rules = [alert.Rule(rule) for rule in rules]
+        self.duration = duration
+        self.directory = directory
+        self.notify = notify
+
+        self.ring = collections.deque(maxlen=self.CAPACITY)
+
+        # (rule, time of trigger) while bursting.
+        self.trigger = None
+        self.processes = []
+
+    @property
+    def bursting(self):
+        return self.trigger is not None
+
+    def record(self, system_status, snapshot):
+        """put ttop.api.Snapshot into the ring. rules are measured on system_status."""
+        now = snapshot.time
+        self.ring.append(snapshot)
+
+        for rule in self.rules:
+            if rule.evaluate(rule.measure(system_status), now) and not self.bursting:
+                self.__start_burst(rule, now)
+
+        if self.bursting and now - self.trigger[1] >= self.duration:
+            self.__end_burst()
+
+    def __start_burst(self, rule, now):
+        self.trigger = (rule, now)
+
+        # the first cpu_percent of a process is meaningless, it is measured at the end of the burst.
+        self.processes = list(psutil.process_iter())
+        for process in self.processes:
+            try:
+                process.cpu_percent(None)
+            except psutil.Error:
+                pass
+
+    def __end_burst(self):
+        rule, trigger_time = self.trigger
+        self.trigger = None
+
+        path = os.path.join(self.directory, time.strftime("ttop-%Y%m%d-%H%M%S.jsonl", time.localtime(trigger_time)))
+        try:
+            self.dump(path, rule, trigger_time, self.__snapshot())
+        except (IOError, OSError):
+            return
+        finally:
+            self.processes = []
+
+        if self.notify:
+            self.notify("ttop: %s, recorded %s" % (rule, path))
+
+    def __snapshot(self):
+        """return top processes by CPU percent during the burst."""
+        snapshot = []
+        for process in self.processes:
+            try:
+                snapshot.append((round(process.cpu_percent(None), 1), round(process.memory_percent(), 1), process.pid, process.name()))
+            except psutil.Error:
+                pass
+
+        snapshot.sort(reverse=True)
+        return snapshot[:self.TOP_PROCESSES]
+
+    def dump(self, path, rule, trigger_time, processes):
+        lines = [{"trigger": str(rule), "time": round(trigger_time, 3), "burst_interval": self.BURST_INTERVAL, "duration": self.duration}]
+
+        for s in self.ring:
+            lines.append({"t": round(s.time, 3), "user": round(s.user, 1), "system": round(s.system, 1), "cores": [round(c, 1) for c in s.cpus],
+                          "mem": round(s.memory, 1), "swap": round(s.swap, 1), "load1": s.load1})
+
+        lines.append({"processes": [{"cpu": cpu, "mem": memory, "pid": pid, "name": name} for cpu, memory, pid, name in processes]})
+
+        with open(path, "w") as f:
+            for line in lines:
+                f.write(json.dumps(line, separators=(",", ":")) + "\n")
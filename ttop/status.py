@@ -0,0 +1,235 @@
+import os
+import sys
+import time
+import errno
+
+# readers of the status line import nothing else. tmux runs them every few seconds,
+# so core and view are imported only by the sampler.
+
+#=======================================
+# tmux status line
+#=======================================
+
+# the sampler exits if nobody has read the status line for this seconds.
+IDLE_TIMEOUT = 60.0
+
+# seconds to wait for the first line of a just started sampler.
+STARTUP_TIMEOUT = 1.0
+
+# seconds between the first two samples. CPU percent needs two reads of /proc/stat.
+FIRST_SAMPLE_DELAY = 0.5
+
+# (short option, long option, default) of ttop status. they are same as usage of ttop.
+OPTIONS = (("-i", "--interval", "1.0"), ("-w", "--width", "10"))
+
+#--------------------
+# StatusLine
+#--------------------
+
+
+class StatusLine(object):
+
+    """compact one line summary for tmux status line.
+    example:
+        CPU [|||    30%] MEM [||||   42%] 0.52 0.40 0.33
+    """
+
+    def __init__(self, system_status, width):
+        from ttop import view
+
+        self.system_status = system_status
+        self.width = width
+        self.gauge = view.HorizontalLineGauge
+
+    def format(self):
+        ss = self.system_status
+        cpu = self._gauge("CPU", ss.cpu.usedPercent, str(ss.cpu.usedPercent))
+        memory = self._gauge("MEM", ss.memory.percent, str(ss.memory.percent))
+
+        return "%s %s %s" % (cpu, memory, ss.loadavg)
+
+    def _gauge(self, label, percent, info_str):
+        if self.width <= 0:
+            return "%s %s" % (label, info_str)
+
+        width = max(self.width, len(info_str))
+        used_n = int(round(percent * width))
+        gauge = self.gauge.GAUGE * used_n + self.gauge.GAUGE_BLANK * (width - used_n)
+        gauge = gauge[:width - len(info_str)] + info_str
+
+        return "%s %s%s%s" % (label, self.gauge.GAUGE_LEFT, gauge, self.gauge.GAUGE_RIGHT)
+
+#--------------------
+# StatusCache
+#--------------------
+
+
+class StatusCache(object):
+
+    """latest status line shared between the sampler and readers.
+
+    the sampler writes the line to a file by rename, so readers never see half written lines.
+    readers touch the pid file, the sampler exits when it has not been touched for IDLE_TIMEOUT.
+    """
+
+    def __init__(self, interval, width, directory=None):
+        directory = directory or os.path.join(os.environ.get("TMPDIR", "/tmp"), "ttop-%d" % os.getuid())
+        name = "status-%s-%d" % (interval, width)
+
+        self.directory = directory
+        self.path = os.path.join(directory, name)
+        self.pid_path = self.path + ".pid"
+
+    def read(self):
+        try:
+            with open(self.path) as f:
+                return f.read()
+        except IOError:
+            return None
+
+    def write(self, line):
+        tmp_path = "%s.%d.tmp" % (self.path, os.getpid())
+        with open(tmp_path, "w") as f:
+            f.write(line)
+        os.rename(tmp_path, self.path)
+
+    def touch(self):
+        try:
+            os.utime(self.pid_path, None)
+        except OSError:
+            pass
+
+    def idle_time(self):
+        try:
+            return time.time() - os.stat(self.pid_path).st_mtime
+        except OSError:
+            return float("inf")
+
+    def sampler_alive(self):
+        try:
+            with open(self.pid_path) as f:
+                pid = int(f.read())
+            os.kill(pid, 0)
+        except (IOError, OSError, ValueError):
+            return False
+
+        return True
+
+    def lock(self):
+        """create pid file. return False if another sampler has already created it.
+        the pid is written to a temporary file and linked into place, so the pid file is never seen empty.
+        """
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory, 0o700)
+
+        if os.path.exists(self.pid_path) and not self.sampler_alive():
+            self.unlock()
+
+        tmp_path = "%s.%d.tmp" % (self.pid_path, os.getpid())
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        os.write(fd, str(os.getpid()).encode())
+        os.close(fd)
+
+        try:
+            os.link(tmp_path, self.pid_path)
+        except OSError as e:
+            if e.errno == errno.EEXIST:
+                return False
+            raise
+        finally:
+            os.remove(tmp_path)
+
+        return True
+
+    def unlock(self):
+        for path in (self.pid_path, self.path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+#=======================================
+# Functions
+#=======================================
+
+
+def main(argv):
+    """run ttop status with argv after "status". return False if argv is not understood, ttop shows its usage then."""
+    values = dict((long, default) for short, long, default in OPTIONS)
+    names = dict((name, long) for short, long, default in OPTIONS for name in (short, long))
+
+    argv = list(argv)
+    while argv:
+        name, sep, value = argv.pop(0).partition("=")
+        if name not in names or not (sep or argv):
+            return False
+        values[names[name]] = value if sep else argv.pop(0)
+
+    try:
+        show(float(values["--interval"]), int(values["--width"]))
+    except ValueError:
+        return False
+
+    return True
+
+
+def show(interval, width):
+    """print latest status line. start background sampler if it is not running."""
+    cache = StatusCache(interval, width)
+
+    if cache.sampler_alive():
+        cache.touch()
+    else:
+        start_sampler(cache, interval, width)
+
+    line = cache.read()
+    waited = 0.0
+    while line is None and waited < STARTUP_TIMEOUT:
+        time.sleep(0.05)
+        waited += 0.05
+        line = cache.read()
+
+    sys.stdout.write((line or "") + "\n")
+
+
+def start_sampler(cache, interval, width):
+    """fork sampler as a daemon process."""
+    pid = os.fork()
+    if pid:
+        os.waitpid(pid, 0)
+        return
+
+    os.setsid()
+    if os.fork():
+        os._exit(0)
+
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+
+    try:
+        run_sampler(cache, interval, width)
+    finally:
+        os._exit(0)
+
+
+def run_sampler(cache, interval, width):
+    if not cache.lock():
+        return
+
+    try:
+        from ttop import core
+
+        system_status = core.SystemStatus()
+        status_line = StatusLine(system_status, width)
+
+        time.sleep(FIRST_SAMPLE_DELAY)
+        system_status.update()
+        cache.write(status_line.format())
+
+        while cache.idle_time() < IDLE_TIMEOUT:
+            time.sleep(interval)
+            system_status.update()
+            cache.write(status_line.format())
+    finally:
+        cache.unlock()
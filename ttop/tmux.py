@@ -1,6 +1,11 @@
 import os
 import subprocess
 
+try:
+    from shlex import quote
+except ImportError:
+    from pipes import quote
+
 #=======================================
 # tmux
 #=======================================
@@ -12,6 +17,15 @@ def call(command):
     return stdout
 
 
+def execute(*arguments):
+    """call tmux subcommand without shell. it is cheaper than call, so it is used for polling."""
+    try:
+        (stdout, stderr) = subprocess.Popen(("tmux",) + arguments, stdout=subprocess.PIPE).communicate()
+    except OSError:
+        return b""
+    return stdout
+
+
 def get_version():
     version = call("-V")
     import re
@@ -34,9 +48,9 @@ def move_last_pane():
     call("last-pane")
 
 
-def resize_pane(width=None, height=None):
+def resize_pane(width=None, height=None, pane=None):
     """resize pane"""
-    resize_option = ""
+    resize_option = " -t " + pane if pane else ""
 
     if width:
         resize_option += " -x " + str(width)
@@ -46,11 +60,48 @@ def resize_pane(width=None, height=None):
     call("resize-pane " + resize_option)
 
 
+def move_pane(pane, target, vertical=True):
+    """split target and move pane into it, without changing focus."""
+    option = "-v" if vertical else "-h"
+    call("move-pane -d %s -s %s -t %s" % (option, pane, target))
+
+
+def largest_pane(pane):
+    """return id of the largest pane in the window of pane except pane itself. None if there is no other pane."""
+    result = call("list-panes -t " + pane + " -F '#{pane_id} #{pane_width} #{pane_height}'")
+
+    panes = []
+    for line in result.decode().splitlines():
+        fields = line.split()
+        if len(fields) == 3 and fields[0] != pane:
+            panes.append((int(fields[1]) * int(fields[2]), fields[0]))
+
+    return max(panes)[1] if panes else None
+
+
 def split_window(vertical=True, horizontal=False, command=None):
     """new pane and exec command."""
     option = "-v" if vertical else "-h"
 
     if command:
-        option += " \"" + command + "\""
+        option += " " + quote(command)
 
     call("split-window " + option)
+
+
+def display_message(message):
+    """show message in tmux status line."""
+    call("display-message " + quote(message))
+
+
+def pane_visible(pane=None):
+    """return True if pane is shown on an attached client. if it is unknown, return True."""
+    target = ("-t", pane) if pane else ()
+    result = execute("display-message", "-p", *(target + ("#{session_attached} #{window_active} #{window_zoomed_flag} #{pane_active}",)))
+
+    fields = result.split()
+    if len(fields) != 4:
+        return True
+
+    attached, window_active, zoomed, pane_active = fields
+    return attached != b"0" and window_active == b"1" and (zoomed != b"1" or pane_active == b"1")
@@ -7,7 +7,8 @@ this tools is designed for use with tmux.
 https://github.com/ton1517/ttop
 
 Usage:
-  ttop [--color <theme>] [--no-color] [--interval <s>] [--no-tmux] [normal | minimal | stack] [horizontal | vertical]
+  ttop [--color <theme>] [--no-color] [--interval <s>] [--no-tmux] [--budget <p>] [--show <items>] [--stats-window <s>] [--alert <rule>]... [--notify <how>] [--record <rule>]... [--burst <s>] [--record-dir <dir>] [--backend <name>] [normal | minimal | stack] [horizontal | vertical]
+  ttop status [--interval <s>] [--width <n>]
   ttop -h | --help
   ttop -v | --version
 
@@ -18,19 +19,35 @@ Options:
   -C --no-color       use monocolor.
   -i --interval <s>   refresh interval(second) [default: 1.0].
   -T --no-tmux        don't use tmux mode.
+  -b --budget <p>     adapt interval to keep CPU usage of ttop in <p> percent of one core.
+  -w --width <n>      gauge width of status line [default: 10].
+  -s --show <items>   show extra lines, comma separated. (items: stats, irq, fs, sched, paging, tcp)
+  --stats-window <s>  window of percentile statistics(second) [default: 60].
+  -a --alert <rule>   alert rule. (e.g. "core>95 for 10", "mem>90", "load1>cores*2")
+  --notify <how>      notify alerts, comma separated. (how: tmux, bell)
+  -r --record <rule>  dump recent samples when rule fires, in the same form as --alert.
+  --burst <s>         sample every 0.1 second for <s> seconds after --record rule fires [default: 10].
+  --record-dir <dir>  directory of dumps of --record [default: .].
+  --backend <name>    screen backend. (name: curses, ansi) [default: curses]
 """
 from __future__ import absolute_import
 
 from ttop import __version__
 
+import os
 import sys
 import curses
-from multiprocessing import Process
+from multiprocessing import Process, Queue
 import time
 
+try:
+    from queue import Empty
+except ImportError:
+    from Queue import Empty
+
 from docopt import docopt
 
-from ttop import core, color, view, tmux
+from ttop import core, color, view, tmux, status, alert, recorder, ansi, api
 from ttop.color import *
 
 #=======================================
@@ -38,6 +55,27 @@ from ttop.color import *
 #=======================================
 
 EXIT_KEYS = (ord("q"), ord("Q"), 27)  # 27:ESC
+ZOOM_OUT_KEYS = (ord("z"),)
+ZOOM_IN_KEYS = (ord("Z"),)
+STYLE_KEYS = (ord("l"),)
+ORIENTATION_KEYS = (ord("o"),)
+THEME_KEYS = (ord("c"),)
+SLOWER_KEYS = (ord("+"), ord("="))
+FASTER_KEYS = (ord("-"),)
+
+STYLES = ("normal", "minimal", "stack")
+ORIENTATIONS = ("horizontal", "vertical")
+THEMES = ("mono", "default", "bright")
+
+# name: color table class
+BACKENDS = {
+    "curses": color.ColorTable,
+    "ansi": ansi.AnsiColorTable,
+}
+
+# interval is doubled or halved by keys within this range.
+MIN_INTERVAL = 0.1
+MAX_INTERVAL = 60.0
 
 #=======================================
 # Functions
@@ -56,17 +94,42 @@ def init_curses():
 
 def create_updater(scr, arguments):
     ss = core.SystemStatus()
+    if "stats" in arguments.show:
+        ss.enable_stats(arguments.stats_window)
+    if "sched" in arguments.show:
+        ss.history("scheduler")
+    if "irq" in arguments.show:
+        ss.enable_interrupts()
+    if "fs" in arguments.show:
+        ss.enable_filesystems()
+    if "paging" in arguments.show:
+        ss.enable_paging()
+    if "tcp" in arguments.show:
+        ss.enable_tcp()
+
+    alerts = alert.AlertEngine(arguments.alert, arguments.notify, scr) if arguments.alert else None
+    flight_recorder = None
+    if arguments.record:
+        notify = alert.AlertEngine([], arguments.notify, scr).notify
+        flight_recorder = recorder.FlightRecorder(arguments.record, arguments.burst, arguments.record_dir, notify)
+
     theme = select_color_theme(arguments)
     layout_class = select_layout_class(arguments)
-    layout = layout_class(scr, theme, ss)
+    layout = layout_class(scr, theme, ss, arguments.show, alerts)
+
+    is_visible = None
+    if tmux.in_tmux():
+        pane = os.getenv("TMUX_PANE")
+        is_visible = lambda: tmux.pane_visible(pane)
 
-    return core.Updater(scr, ss, arguments.interval, layout)
+    sampler = api.Sampler(arguments.interval, ss)
+    return core.Updater(scr, sampler, arguments.interval, layout, alerts, is_visible, arguments.budget, flight_recorder)
 
 
 def new_pane_and_exec_process(arguments):
     layout_class = select_layout_class(arguments)
-    width, height = (layout_class.WIDTH, layout_class.HEIGHT)
-    command = " ".join(sys.argv) + " --no-tmux"
+    width, height = layout_class.size(arguments.show)
+    command = " ".join(tmux.quote(arg) for arg in sys.argv) + " --no-tmux"
 
     # if horizontal option, split-window -v. if vertical option, split-window -h.
     tmux.split_window(arguments.horizontal, arguments.vertical, command)
@@ -75,14 +138,16 @@ def new_pane_and_exec_process(arguments):
     tmux.swap_pane()
 
 
-def select_color_theme(arguments):
-    color_table = color.ColorTable()
-    color_theme_name = "default"
-
+def select_color_theme_name(arguments):
     if arguments.no_color:
-        color_theme_name = "mono"
-    elif arguments.color:
-        color_theme_name = arguments.color
+        return "mono"
+
+    return arguments.color or "default"
+
+
+def select_color_theme(arguments):
+    color_table = BACKENDS[arguments.backend]()
+    color_theme_name = select_color_theme_name(arguments)
 
     theme_class_name = color_theme_name.capitalize() + "ColorTheme"
     theme_class = globals().get(theme_class_name, DefaultColorTheme)
@@ -108,39 +173,156 @@ def select_layout_class(arguments):
     return layout_class
 
 
-def start_process(updater):
-    p = Process(target=update_handler, args=(updater,))
+def next_name(names, name):
+    """return name next to name in names. if name isn't in names, return the first."""
+    if name not in names:
+        return names[0]
+
+    return names[(names.index(name) + 1) % len(names)]
+
+
+def switch_layout(updater, arguments, style, orientation):
+    """replace layout of updater, and fit tmux pane to it."""
+    reoriented = not getattr(arguments, orientation)
+
+    for name in STYLES:
+        setattr(arguments, name, name == style)
+    for name in ORIENTATIONS:
+        setattr(arguments, name, name == orientation)
+
+    layout_class = select_layout_class(arguments)
+    updater.set_layout(layout_class(updater.scr, updater.layout.color_theme, updater.system_status, arguments.show, updater.alerts))
+
+    fit_pane(arguments, layout_class, reoriented)
+
+
+def switch_color_theme(updater, arguments):
+    arguments.no_color = False
+    arguments.color = next_name(THEMES, select_color_theme_name(arguments))
+
+    layout = updater.layout
+    updater.set_layout(layout.__class__(updater.scr, select_color_theme(arguments), updater.system_status, layout.show, updater.alerts))
+
+
+def fit_pane(arguments, layout_class, reoriented):
+    """resize tmux pane to layout. if orientation is changed, the pane is moved to be split in the other direction."""
+    pane = os.getenv("TMUX_PANE")
+    if not tmux.in_tmux() or not pane:
+        return
+
+    if reoriented:
+        target = tmux.largest_pane(pane)
+        if target:
+            tmux.move_pane(pane, target, arguments.horizontal)
+
+    width, height = layout_class.size(arguments.show)
+    tmux.resize_pane(width, height, pane)
+
+
+def start_process(updater, arguments):
+    """start update process. return queue to send keys to it."""
+    keys = Queue()
+    p = Process(target=update_handler, args=(updater, arguments, keys))
     p.daemon = True
     p.start()
 
+    return keys
 
-def update_handler(updater):
+
+def update_handler(updater, arguments, keys):
     while True:
         updater.update()
-        time.sleep(updater.interval)
+        wait_until(updater, arguments, keys, time.time() + updater.wait_interval())
 
 
-def wait_key_and_exit(scr):
+def wait_until(updater, arguments, keys, deadline):
+    """handle keys until deadline. while screen is hidden, it is drawn as soon as it is shown."""
+    while True:
+        timeout = deadline - time.time()
+        if timeout <= 0:
+            return
+
+        if not updater.visible:
+            timeout = min(timeout, updater.VISIBILITY_INTERVAL)
+
+        try:
+            handle_key(updater, arguments, keys.get(timeout=timeout))
+        except Empty:
+            if not updater.visible and updater.check_visibility():
+                updater.draw()
+
+
+def handle_key(updater, arguments, c):
+    style = [name for name in STYLES if getattr(arguments, name)][0]
+    orientation = [name for name in ORIENTATIONS if getattr(arguments, name)][0]
+
+    if c in ZOOM_OUT_KEYS:
+        updater.layout.zoom(1)
+    elif c in ZOOM_IN_KEYS:
+        updater.layout.zoom(-1)
+    elif c in STYLE_KEYS:
+        switch_layout(updater, arguments, next_name(STYLES, style), orientation)
+    elif c in ORIENTATION_KEYS:
+        switch_layout(updater, arguments, style, next_name(ORIENTATIONS, orientation))
+    elif c in THEME_KEYS:
+        switch_color_theme(updater, arguments)
+    elif c in SLOWER_KEYS:
+        updater.set_interval(min(updater.interval * 2, MAX_INTERVAL))
+    elif c in FASTER_KEYS:
+        updater.set_interval(max(updater.interval / 2, MIN_INTERVAL))
+    elif c == curses.KEY_RESIZE:
+        updater.resize()
+    else:
+        return
+
+    updater.draw()
+
+
+def wait_key_and_exit(scr, keys):
     while True:
         c = scr.getch()
 
         if c in EXIT_KEYS:
             sys.exit()
 
+        keys.put(c)
+
 
 def hook_curses(scr, arguments):
     init_curses()
+    run(scr, arguments)
+
+
+def hook_ansi(scr, arguments):
+    run(scr, arguments)
+
 
+def run(scr, arguments):
     updater = create_updater(scr, arguments)
-    start_process(updater)
+    keys = start_process(updater, arguments)
 
-    wait_key_and_exit(scr)
+    wait_key_and_exit(scr, keys)
 
 
 def main():
     arg_dict = docopt(__doc__, version="ttop " + __version__)
     arguments = core.Arguments(arg_dict)
 
+    if arguments.status:
+        status.show(arguments.interval, arguments.width)
+        sys.exit()
+
+    if arguments.backend not in BACKENDS:
+        print("unknown backend: " + arguments.backend)
+        sys.exit(1)
+
+    for rule in arguments.alert + arguments.record:
+        try:
+            alert.Rule(rule)
+        except ValueError as e:
+            print(e)
+            sys.exit(1)
+
     if tmux.in_tmux() and not arguments.no_tmux:
         if tmux.get_version() < 1.8:
             print("your tmux version is " + str(tmux.get_version()) + ".")
@@ -151,7 +333,10 @@ def main():
 
         sys.exit()
 
-    curses.wrapper(hook_curses, arguments)
+    if arguments.backend == "ansi":
+        ansi.wrapper(hook_ansi, arguments)
+    else:
+        curses.wrapper(hook_curses, arguments)
 
 if __name__ == "__main__":
     main()
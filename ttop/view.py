@@ -21,6 +21,11 @@ class ViewBase(object):
         self.color_theme = color_theme
         self.resource = resource
 
+    @classmethod
+    def height(cls):
+        """return lines of view. layouts read it when their size is computed."""
+        return cls.HEIGHT
+
     def draw(self, y, x, length):
         pass
 
@@ -48,16 +53,34 @@ class ViewBase(object):
 
 class ResourceView(ViewBase):
 
+    # (attribute name of percent, attribute name of color theme) of stacked gauge, from the bottom.
+    SEGMENTS = ()
+
     def __init__(self, scr, color_theme, label, resource):
         ViewBase.__init__(self, scr, color_theme, resource)
         self.label = label
 
+        # (AlertEngine, metric name). it is set by Layout.
+        self.alert = None
+
+    def _label_attr(self):
+        if self.alert:
+            alerts, metric = self.alert
+            if alerts.is_alerting(metric, self.resource):
+                return self.color_theme.ALERT
+
+        if getattr(self.resource, "throttled", False):
+            return self.color_theme.THROTTLED
+
+        return self.color_theme.LABEL
+
     def draw(self, y, x, length):
         self._draw_label(y, x, length)
         self._draw_frame(y, x, length)
 
         start_position, resource_length = self._calc_resource_area(y, x, length)
         self._draw_resource(y, x, length, start_position, resource_length)
+        self._draw_overlay(y, x, length, start_position, resource_length)
 
         self._draw_info(y, x, length, self._get_info_str())
 
@@ -73,12 +96,51 @@ class ResourceView(ViewBase):
     def _draw_resource(self, y, x, length, start_position, resource_length):
         pass
 
+    def _draw_overlay(self, y, x, length, start_position, resource_length):
+        pass
+
     def _get_info_str(self):
         pass
 
     def _draw_info(self, y, x, length, info_str):
         pass
 
+    def _stacked_segments(self, resource, length):
+        return stacked_segments([(getattr(resource, name), attr) for name, attr in self.SEGMENTS], length, self.color_theme)
+
+    def _draw_column(self, y, x, height, segments):
+        """draw list of (gauge length, attr) from the bottom of column. the rest is blank."""
+        used_n = sum(n for n, attr in segments)
+
+        for i in range(height - used_n):
+            self.addstr(y + i, x, self.GAUGE_BLANK)
+
+        now_y = y + height
+        for n, attr in segments:
+            for i in range(n):
+                self.addstr(now_y - i - 1, x, self.GAUGE, attr)
+            now_y -= n
+
+#--------------------
+# stacked_segments
+#--------------------
+
+
+def stacked_segments(parts, length, color_theme):
+    """return list of (gauge length, attr) of parts, list of (percent, attribute name of color theme).
+    boundaries are rounded from cumulative percent, so the sum doesn't drift by rounding.
+    """
+    segments = []
+    cumulative = 0.0
+    last_n = 0
+    for percent, attr in parts:
+        cumulative += percent
+        n = min(int(round(cumulative * length)), length)
+        segments.append((n - last_n, getattr(color_theme, attr)))
+        last_n = n
+
+    return segments
+
 #--------------------
 # HorizontalLineGauge
 #--------------------
@@ -88,19 +150,22 @@ class HorizontalLineGauge(ResourceView):
 
     """horizontal 1 line gauge.
     example:
-        CPU [||||||||||       50%]
+        CPU [||||||||||   +  !50%]
+    "+" and "!" are p95 and max markers, they are drawn if resource has stats.
     """
 
     GAUGE_LEFT = "["
     GAUGE_RIGHT = "]"
     GAUGE = "|"
     GAUGE_BLANK = " "
+    GAUGE_P95 = "+"
+    GAUGE_MAX = "!"
 
     LABEL_WIDTH = 3
 
     def _draw_label(self, y, x, width):
         llabel = self.label.ljust(self.LABEL_WIDTH)
-        self.addstr(y, x, llabel, self.color_theme.LABEL)
+        self.addstr(y, x, llabel, self._label_attr())
 
     def _draw_frame(self, y, x, width):
         self.addstr(y, x + self.LABEL_WIDTH, self.GAUGE_LEFT, self.color_theme.FRAME)
@@ -112,7 +177,22 @@ class HorizontalLineGauge(ResourceView):
         return now_x, resource_width
 
     def _draw_resource(self, y, x, width, start_x, resource_width):
-        pass
+        now_x = start_x
+        for n, attr in self._stacked_segments(self.resource, resource_width):
+            self.addstr(y, now_x, self.GAUGE * n, attr)
+            now_x += n
+
+        self.addstr(y, now_x, self.GAUGE_BLANK * (resource_width - (now_x - start_x)))
+
+    def _draw_overlay(self, y, x, width, start_x, resource_width):
+        stats = getattr(self.resource, "stats", None)
+        if not stats or not stats.size or resource_width <= 0:
+            return
+
+        percentiles = self.resource.stats.percentiles()
+        for marker, percent in ((self.GAUGE_P95, percentiles.p95), (self.GAUGE_MAX, percentiles.max)):
+            marker_x = start_x + min(int(percent * resource_width), resource_width - 1)
+            self.addstr(y, marker_x, marker, self.color_theme.STATS_MARKER)
 
     def _get_info_str(self):
         pass
@@ -121,6 +201,63 @@ class HorizontalLineGauge(ResourceView):
         start_x = x + width - len(self.GAUGE_RIGHT) - len(info_str)
         self.addstr_with_existing_attr(y, start_x, info_str, self.color_theme.PERCENT)
 
+#--------------------
+# cpu_sensor_strs
+#--------------------
+
+
+def cpu_sensor_strs(cpu, freq_format, temp_format):
+    """return list of known frequency(GHz) and temperature strings."""
+    strs = []
+    if cpu.freq is not None:
+        strs.append(freq_format % (cpu.freq / 1000.0))
+    if cpu.temp is not None:
+        strs.append(temp_format % cpu.temp)
+
+    return strs
+
+#--------------------
+# compact_sensor_strs
+#--------------------
+
+# formats from the most precise. the first one which fits is used.
+COMPACT_FREQ_FORMATS = ("%.1fG", "%.1f", "%.0fG", "%.0f")
+COMPACT_TEMP_FORMATS = ("%dC", "%d")
+
+# temperature which doesn't fit, such as 100C in 2 columns.
+COMPACT_TEMP_HIGH = "HI"
+
+
+def compact_sensor_strs(cpu, width):
+    """return list of known frequency(GHz) and temperature strings which fit in width.
+    example (width 2):
+        ["2G", "61"], ["3G", "HI"]
+    """
+    strs = []
+    if cpu.freq is not None:
+        strs.append(_first_fit([f % (cpu.freq / 1000.0) for f in COMPACT_FREQ_FORMATS], width))
+    if cpu.temp is not None:
+        strs.append(_first_fit([f % cpu.temp for f in COMPACT_TEMP_FORMATS] + [COMPACT_TEMP_HIGH], width))
+
+    return strs
+
+
+def _first_fit(strs, width):
+    for s in strs:
+        if len(s) <= width:
+            return s
+
+    return strs[-1][:width]
+
+#--------------------
+# CPU_SEGMENTS
+#--------------------
+
+# nice, user, system, irq, softirq, steal and iowait time. percent of CPU doesn't include iowait, but gauges do.
+CPU_SEGMENTS = (("nicePercent", "CPU_GAUGE_NICE"), ("userPercent", "CPU_GAUGE_USER"), ("systemPercent", "CPU_GAUGE_SYSTEM"),
+                ("irqPercent", "CPU_GAUGE_IRQ"), ("softirqPercent", "CPU_GAUGE_SOFTIRQ"), ("stealPercent", "CPU_GAUGE_STEAL"),
+                ("iowaitPercent", "CPU_GAUGE_IOWAIT"))
+
 #--------------------
 # CPUHorizontalLineGauge
 #--------------------
@@ -128,16 +265,23 @@ class HorizontalLineGauge(ResourceView):
 
 class CPUHorizontalLineGauge(HorizontalLineGauge):
 
-    def _draw_resource(self, y, x, width, start_x, resource_width):
-        user_n = int(self.resource.userPercent * resource_width)
-        system_n = int(self.resource.systemPercent * resource_width)
+    """nice, user, system, irq, softirq, steal and iowait time are stacked. percent doesn't include iowait.
+    example:
+        CPU [||||||||||||                  3.20G 45C 40%]
+    """
 
-        self.addstr(y, start_x, self.GAUGE * user_n, self.color_theme.CPU_GAUGE_USER)
-        self.addstr(y, start_x + user_n, self.GAUGE * system_n, self.color_theme.CPU_GAUGE_SYSTEM)
-        self.addstr(y, start_x + user_n + system_n, self.GAUGE_BLANK * (resource_width - (user_n + system_n)))
+    SEGMENTS = CPU_SEGMENTS
 
     def _get_info_str(self):
-        return str(self.resource.usedPercent)
+        return " ".join(cpu_sensor_strs(self.resource, "%.2fG", "%dC") + [str(self.resource.usedPercent)])
+
+#--------------------
+# MEMORY_SEGMENTS
+#--------------------
+
+# used, buffers, cached and dirty/writeback memory.
+MEMORY_SEGMENTS = (("percent", "MEM_GAUGE_USED"), ("buffersPercent", "MEM_GAUGE_BUFFERS"),
+                   ("cachedPercent", "MEM_GAUGE_CACHED"), ("dirtyPercent", "MEM_GAUGE_DIRTY"))
 
 #--------------------
 # MemoryHorizontalLineGauge
@@ -146,10 +290,36 @@ class CPUHorizontalLineGauge(HorizontalLineGauge):
 
 class MemoryHorizontalLineGauge(HorizontalLineGauge):
 
+    """used, buffers, cached and dirty/writeback memory are stacked.
+    example:
+        MEM [||||||||||||||||  2048M/8192M 25% avail 5000M]
+    """
+
+    SEGMENTS = MEMORY_SEGMENTS
+
+    def _get_info_str(self):
+        detail = self.resource.detail_str()
+        return "%s %s" % (self.resource, detail) if detail else str(self.resource)
+
+#--------------------
+# PressureHorizontalLineGauge
+#--------------------
+
+
+class PressureHorizontalLineGauge(HorizontalLineGauge):
+
+    """stall time rate of PSI. full is drawn over some.
+    example:
+        IOs [||||        1.20/0.30 12%]
+    """
+
     def _draw_resource(self, y, x, width, start_x, resource_width):
-        used_n = int(round(self.resource.percent * resource_width))
-        self.addstr(y, start_x, self.GAUGE * used_n, self.color_theme.MEM_GAUGE_USED)
-        self.addstr(y, start_x + used_n, self.GAUGE_BLANK * (resource_width - used_n))
+        some_n = int(round(self.resource.somePercent * resource_width))
+        full_n = min(int(round(self.resource.fullPercent * resource_width)), some_n)
+
+        self.addstr(y, start_x, self.GAUGE * full_n, self.color_theme.PSI_GAUGE_FULL)
+        self.addstr(y, start_x + full_n, self.GAUGE * (some_n - full_n), self.color_theme.PSI_GAUGE_SOME)
+        self.addstr(y, start_x + some_n, self.GAUGE_BLANK * (resource_width - some_n))
 
     def _get_info_str(self):
         return str(self.resource)
@@ -170,7 +340,7 @@ class VerticalLineGauge(ResourceView):
 
     def _draw_label(self, y, x, height):
         llabel = self.label[:self.WIDTH].center(self.WIDTH)
-        self.addstr(y, x, llabel, self.color_theme.LABEL)
+        self.addstr(y, x, llabel, self._label_attr())
 
     def _draw_frame(self, y, x, height):
         self.addstr(y + 1, x, self.GAUGE_TOP, self.color_theme.FRAME)
@@ -181,7 +351,7 @@ class VerticalLineGauge(ResourceView):
         return y + 2, height - 3
 
     def _draw_resource(self, y, x, height, start_y, resource_height):
-        pass
+        self._draw_column(start_y, x, resource_height, self._stacked_segments(self.resource, resource_height))
 
     def _get_info_str(self):
         pass
@@ -197,23 +367,62 @@ class VerticalLineGauge(ResourceView):
 
 class CPUVerticalLineGauge(VerticalLineGauge):
 
+    SEGMENTS = CPU_SEGMENTS
+
+    def _get_info_str(self):
+        return str(self.resource.usedPercent)
+
+    def _draw_info(self, y, x, height, info_str):
+        VerticalLineGauge._draw_info(self, y, x, height, info_str)
+
+        # frequency and temperature are drawn under percent. 1 column is left blank, so adjacent gauges don't run together.
+        for i, sensor_str in enumerate(compact_sensor_strs(self.resource, self.WIDTH - 1)):
+            self.addstr_with_existing_attr(y + 3 + i, x, sensor_str.rjust(self.WIDTH), self.color_theme.PERCENT)
+
+#--------------------
+# runqueue_heat
+#--------------------
+
+
+# (lower bound of run queue wait(second per second), character). a character is denser as tasks wait longer.
+RUNQUEUE_HEAT = ((0.5, "#"), (0.25, "*"), (0.1, "+"), (0.05, "="), (0.01, "-"), (0.001, ":"), (0.0, "."))
+
+
+def runqueue_heat(wait, color_theme):
+    """return (character, attr) of run queue wait."""
+    char = [c for bound, c in RUNQUEUE_HEAT if wait >= bound][0] if wait > 0 else "."
+
+    if wait < 0.01:
+        return char, color_theme.RUNQUEUE_HEAT_LOW
+    elif wait < 0.1:
+        return char, color_theme.RUNQUEUE_HEAT_MEDIUM
+    else:
+        return char, color_theme.RUNQUEUE_HEAT_HIGH
+
+#--------------------
+# RunQueueVerticalLineGauge
+#--------------------
+
+
+class RunQueueVerticalLineGauge(VerticalLineGauge):
+
+    """run queue wait per CPU. the gauge is full when one task is always waiting on every CPU."""
+
     def _draw_resource(self, y, x, height, start_y, resource_height):
-        user_n = int(self.resource.userPercent * resource_height)
-        system_n = int(self.resource.systemPercent * resource_height)
+        wait_n = int(round(self.__load() * resource_height))
+        attr = runqueue_heat(self.resource.wait / core.CPU.NUM_CPUS, self.color_theme)[1]
 
-        for i in range(resource_height - (user_n + system_n)):
+        for i in range(resource_height - wait_n):
             self.addstr(start_y + i, x, self.GAUGE_BLANK)
 
-        now_y = start_y + resource_height - (user_n + system_n)
-        for i in range(system_n):
-            self.addstr(now_y + i, x, self.GAUGE, self.color_theme.CPU_GAUGE_SYSTEM)
-
-        now_y += system_n
-        for i in range(user_n):
-            self.addstr(now_y + i, x, self.GAUGE, self.color_theme.CPU_GAUGE_USER)
+        for i in range(wait_n):
+            self.addstr(start_y + resource_height - wait_n + i, x, self.GAUGE, attr)
 
     def _get_info_str(self):
-        return str(self.resource.usedPercent)
+        return str(core.Percent(self.__load() * 100))
+
+    def __load(self):
+        return min(self.resource.wait / core.CPU.NUM_CPUS, 1.0)
 
 #--------------------
 # MemoryVerticalLineGauge
@@ -222,18 +431,35 @@ class CPUVerticalLineGauge(VerticalLineGauge):
 
 class MemoryVerticalLineGauge(VerticalLineGauge):
 
+    SEGMENTS = MEMORY_SEGMENTS
+
+    def _get_info_str(self):
+        return str(self.resource.percent)
+
+#--------------------
+# PressureVerticalLineGauge
+#--------------------
+
+
+class PressureVerticalLineGauge(VerticalLineGauge):
+
     def _draw_resource(self, y, x, height, start_y, resource_height):
-        used_n = int(round(self.resource.percent * resource_height))
+        some_n = int(round(self.resource.somePercent * resource_height))
+        full_n = min(int(round(self.resource.fullPercent * resource_height)), some_n)
 
-        for i in range(resource_height - used_n):
+        for i in range(resource_height - some_n):
             self.addstr(start_y + i, x, self.GAUGE_BLANK)
 
-        now_y = start_y + resource_height - used_n
-        for i in range(used_n):
-            self.addstr(now_y + i, x, self.GAUGE, self.color_theme.MEM_GAUGE_USED)
+        now_y = start_y + resource_height - some_n
+        for i in range(some_n - full_n):
+            self.addstr(now_y + i, x, self.GAUGE, self.color_theme.PSI_GAUGE_SOME)
+
+        now_y += some_n - full_n
+        for i in range(full_n):
+            self.addstr(now_y + i, x, self.GAUGE, self.color_theme.PSI_GAUGE_FULL)
 
     def _get_info_str(self):
-        return str(self.resource.percent)
+        return str(self.resource.somePercent)
 
 #--------------------
 # HorizontalStackView
@@ -247,19 +473,24 @@ class HorizontalStackView(ResourceView):
     GAUGE_BOTTOM = "_"
     GAUGE = "|"
     GAUGE_BLANK = " "
+    GAUGE_PEAK = "-"
 
     LABEL_WIDTH = 3
 
-    def __init__(self, scr, color_theme, label, resource):
+    def __init__(self, scr, color_theme, label, resource, resource_history):
         ResourceView.__init__(self, scr, color_theme, label, resource)
 
-        self.resource_history = core.ResourceHistory(resource.__class__)
-        self.resources = []
+        self.resource_history = resource_history
+        self.tier = 0
+
+    def zoom(self, step):
+        """change history tier. positive step shows longer period."""
+        self.tier = max(0, min(self.tier + step, len(self.resource_history.tiers) - 1))
 
     def _draw_label(self, y, x, length):
         height = length[1]
         llabel = self.label[:self.LABEL_WIDTH].ljust(self.LABEL_WIDTH)
-        self.addstr(y + int(height / 2), x, llabel, self.color_theme.LABEL)
+        self.addstr(y + int(height / 2), x, llabel, self._label_attr())
 
     def _draw_frame(self, y, x, length):
         width, height = length
@@ -273,21 +504,32 @@ class HorizontalStackView(ResourceView):
 
     def _draw_resource(self, y, x, length, start_x, resource_length):
         resource_width, resource_height = resource_length
-        self.resource_history.pack(resource_width)
-        self.resource_history.push(self.resource, resource_width)
+        rollups = self.resource_history.get(self.tier, resource_width)
+
+        for i, rollup in enumerate(rollups):
+            self._draw_gauge(y, start_x + i, resource_height, rollup.mean)
+            if self.tier:
+                self._draw_peak(y, start_x + i, resource_height, rollup.max)
 
-        for i in range(resource_width):
-            self._draw_gauge(y, start_x + i, resource_height, self.resource_history.get(i))
+    def _draw_peak(self, y, x, height, resource):
+        peak_n = self._gauge_height(resource, height)
+        if peak_n > 0:
+            self.addstr(y + height - peak_n, x, self.GAUGE_PEAK, self.color_theme.FRAME)
 
     def _get_info_str(self):
         pass
 
     def _draw_info(self, y, x, length, info_str):
         width = length[0]
+        if self.tier:
+            info_str = "%s %s" % (self.resource_history.tiers[self.tier].name, info_str)
         self.addstr_with_existing_attr(y, x + width - len(info_str) - 1, info_str, self.color_theme.PERCENT)
 
+    def _gauge_height(self, resource, height):
+        return sum(n for n, attr in self._stacked_segments(resource, height))
+
     def _draw_gauge(self, y, x, height, resource):
-        pass
+        self._draw_column(y, x, height, self._stacked_segments(resource, height))
 
 #--------------------
 # CPUHorizontalStackView
@@ -296,43 +538,104 @@ class HorizontalStackView(ResourceView):
 
 class CPUHorizontalStackView(HorizontalStackView):
 
+    SEGMENTS = CPU_SEGMENTS
+
     def _get_info_str(self):
         return str(self.resource.usedPercent)
 
-    def _draw_gauge(self, y, x, height, resource):
-        user_n = int(resource.userPercent * height)
-        system_n = int(resource.systemPercent * height)
+#--------------------
+# MemoryHorizontalStackView
+#--------------------
 
-        for i in range(height - (user_n + system_n)):
-            self.addstr(y + i, x, self.GAUGE_BLANK)
 
-        now_y = y + height - (user_n + system_n)
-        for i in range(system_n):
-            self.addstr(now_y + i, x, self.GAUGE, self.color_theme.CPU_GAUGE_SYSTEM)
+class MemoryHorizontalStackView(HorizontalStackView):
 
-        now_y += system_n
-        for i in range(user_n):
-            self.addstr(now_y + i, x, self.GAUGE, self.color_theme.CPU_GAUGE_USER)
+    SEGMENTS = MEMORY_SEGMENTS
+
+    def _get_info_str(self):
+        return str(self.resource)
 
 #--------------------
-# MemoryHorizontalStackView
+# PressureHorizontalStackView
 #--------------------
 
 
-class MemoryHorizontalStackView(HorizontalStackView):
+class PressureHorizontalStackView(HorizontalStackView):
+
+    """some stall time rates of CPU, memory and IO. each of them has a third of height."""
 
     def _get_info_str(self):
-        return str(self.resource)
+        return "%d/%d/%d%%" % tuple(round(v) for v in self.resource.values())
+
+    def _gauge_height(self, resource, height):
+        return sum(int(v / 100.0 * height / 3) for v in resource.values())
 
     def _draw_gauge(self, y, x, height, resource):
-        used_n = int(round(resource.percent * height))
+        cpu_n, memory_n, io_n = [int(v / 100.0 * height / 3) for v in resource.values()]
+        used_n = cpu_n + memory_n + io_n
 
         for i in range(height - used_n):
             self.addstr(y + i, x, self.GAUGE_BLANK)
 
         now_y = y + height - used_n
-        for i in range(used_n):
-            self.addstr(now_y + i, x, self.GAUGE, self.color_theme.MEM_GAUGE_USED)
+        for n, attr in ((io_n, self.color_theme.PSI_GAUGE_IO), (memory_n, self.color_theme.PSI_GAUGE_MEMORY), (cpu_n, self.color_theme.PSI_GAUGE_CPU)):
+            for i in range(n):
+                self.addstr(now_y + i, x, self.GAUGE, attr)
+            now_y += n
+
+#--------------------
+# RateHorizontalStackView
+#--------------------
+
+
+class RateHorizontalStackView(HorizontalStackView):
+
+    """rates which share height equally. each of them is scaled to its own maximum in the shown history."""
+
+    # (attribute name of rate, attribute name of color theme), from the bottom.
+    RATES = ()
+
+    def _get_info_str(self):
+        return "/".join(str(getattr(self.resource, name)) for name, attr in self.RATES)
+
+    def _draw_resource(self, y, x, length, start_x, resource_length):
+        rollups = self.resource_history.get(self.tier, resource_length[0])
+        self.scales = [max([getattr(rollup.max, name) for rollup in rollups] + [1.0]) for name, attr in self.RATES]
+
+        HorizontalStackView._draw_resource(self, y, x, length, start_x, resource_length)
+
+    def _segments(self, resource, height):
+        return [int(getattr(resource, name) / scale * height / len(self.RATES)) for (name, attr), scale in zip(self.RATES, self.scales)]
+
+    def _gauge_height(self, resource, height):
+        return sum(self._segments(resource, height))
+
+    def _draw_gauge(self, y, x, height, resource):
+        segments = zip(self._segments(resource, height), self.RATES)
+        self._draw_column(y, x, height, [(n, getattr(self.color_theme, attr)) for n, (name, attr) in segments])
+
+#--------------------
+# SchedulerHorizontalStackView
+#--------------------
+
+
+class SchedulerHorizontalStackView(RateHorizontalStackView):
+
+    """context switch and fork rates."""
+
+    RATES = (("ctxtRate", "SCHED_GAUGE_CTXT"), ("forkRate", "SCHED_GAUGE_FORKS"))
+
+#--------------------
+# PagingHorizontalStackView
+#--------------------
+
+
+class PagingHorizontalStackView(RateHorizontalStackView):
+
+    """swap in, swap out, major fault and direct reclaim scan rates."""
+
+    RATES = (("swapInRate", "PAGING_GAUGE_SWAPIN"), ("swapOutRate", "PAGING_GAUGE_SWAPOUT"),
+             ("majfaultRate", "PAGING_GAUGE_MAJFAULT"), ("scanDirectRate", "PAGING_GAUGE_SCAN"))
 
 #--------------------
 # InfoTextLine
@@ -341,6 +644,8 @@ class MemoryHorizontalStackView(HorizontalStackView):
 
 class InfoTextLine(ViewBase):
 
+    HEIGHT = 1
+
     def draw(self, y, x, width):
         uptime = str(self.resource.uptime)
         avg1 = "%.2f " % self.resource.loadavg.avg1
@@ -360,6 +665,10 @@ class InfoTextLine(ViewBase):
         now_x = self._insstr(y, now_x, ", Processes ", self.color_theme.LABEL, max_x)
         now_x = self._insstr(y, now_x, procs, self.color_theme.PROCS, max_x)
 
+        if self.resource.interval is not None:
+            now_x = self._insstr(y, now_x, ", Interval ", self.color_theme.LABEL, max_x)
+            now_x = self._insstr(y, now_x, "%.2fs" % self.resource.interval, self.color_theme.INTERVAL, max_x)
+
     def _insstr(self, y, x, text, option, max_x):
         next_x = x + len(text)
         if x >= max_x:
@@ -369,6 +678,292 @@ class InfoTextLine(ViewBase):
 
         return next_x
 
+#--------------------
+# IntervalTextLine
+#--------------------
+
+
+class IntervalTextLine(InfoTextLine):
+
+    """effective interval for vertical layouts, they have no InfoTextLine.
+    example:
+        ~1.6s
+    """
+
+    def draw(self, y, x, width):
+        max_x = x + width
+
+        now_x = self._insstr(y, x, "~", self.color_theme.LABEL, max_x)
+        self._insstr(y, now_x, "%.1fs" % self.resource.interval, self.color_theme.INTERVAL, max_x)
+
+#--------------------
+# StatsTextLine
+#--------------------
+
+
+class StatsTextLine(InfoTextLine):
+
+    """percentiles of CPU and memory.
+    example:
+        CPU p50 12% p95 40% p99 70% max 90%, MEM p50 30% p95 31% p99 31% max 32%
+    """
+
+    def draw(self, y, x, width):
+        max_x = x + width
+
+        now_x = x
+        for label, resource in (("CPU ", self.resource.cpu), (", MEM ", self.resource.memory)):
+            if not resource.stats:
+                continue
+
+            now_x = self._insstr(y, now_x, label, self.color_theme.LABEL, max_x)
+            now_x = self._insstr(y, now_x, str(resource.stats.percentiles()), self.color_theme.STATS, max_x)
+
+#--------------------
+# CPUTimesTextLine
+#--------------------
+
+
+class CPUTimesTextLine(InfoTextLine):
+
+    """CPU time which is not user or system. steal and iowait have the busiest core too.
+    example:
+        Steal 0.3% max 2.1% cpu 3, IOwait 1.2% max 5.0% cpu 2, IRQ 0.4%, Softirq 0.2%, Nice 0.0%
+    """
+
+    def draw(self, y, x, width):
+        cpu = self.resource.cpu
+        max_x = x + width
+
+        now_x = x
+        for i, (label, name, attr) in enumerate((("Steal ", "stealPercent", self.color_theme.CPU_GAUGE_STEAL),
+                                                 ("IOwait ", "iowaitPercent", self.color_theme.CPU_GAUGE_IOWAIT))):
+            now_x = self._insstr(y, now_x, (", " if i else "") + label, self.color_theme.LABEL, max_x)
+            now_x = self._insstr(y, now_x, "%.1f%%" % getattr(cpu, name).percent, attr, max_x)
+
+            busiest = max(range(len(self.resource.each_cpu)), key=lambda c: getattr(self.resource.each_cpu[c], name))
+            now_x = self._insstr(y, now_x, " max ", self.color_theme.LABEL, max_x)
+            now_x = self._insstr(y, now_x, "%.1f%%" % getattr(self.resource.each_cpu[busiest], name).percent, attr, max_x)
+            now_x = self._insstr(y, now_x, " cpu %d" % (busiest + 1), self.color_theme.LABEL, max_x)
+
+        for label, percent, attr in ((", IRQ ", cpu.irqPercent, self.color_theme.CPU_GAUGE_IRQ),
+                                     (", Softirq ", cpu.softirqPercent, self.color_theme.CPU_GAUGE_SOFTIRQ),
+                                     (", Nice ", cpu.nicePercent, self.color_theme.CPU_GAUGE_NICE)):
+            now_x = self._insstr(y, now_x, label, self.color_theme.LABEL, max_x)
+            now_x = self._insstr(y, now_x, "%.1f%%" % percent.percent, attr, max_x)
+
+#--------------------
+# RunQueueHeatRow
+#--------------------
+
+
+class RunQueueHeatRow(InfoTextLine):
+
+    """run queue wait from /proc/schedstat. a character per CPU shows its wait as heat, followed by the total.
+    example:
+        RQ  ..:-.+..:.  Wait 123ms/s max 80ms/s cpu 6, Slices 12.3k/s
+    """
+
+    def draw(self, y, x, width):
+        each_runqueue = self.resource.each_runqueue
+        max_x = x + width
+
+        now_x = self._insstr(y, x, "RQ  ", self.color_theme.LABEL, max_x)
+        for runqueue in each_runqueue:
+            char, attr = runqueue_heat(runqueue.wait, self.color_theme)
+            now_x = self._insstr(y, now_x, char, attr, max_x)
+
+        now_x = self._insstr(y, now_x, "  Wait ", self.color_theme.LABEL, max_x)
+        now_x = self._insstr(y, now_x, str(self.resource.runqueue), self.color_theme.RATE, max_x)
+
+        if each_runqueue:
+            busiest = max(range(len(each_runqueue)), key=lambda c: each_runqueue[c].wait)
+            now_x = self._insstr(y, now_x, " max ", self.color_theme.LABEL, max_x)
+            now_x = self._insstr(y, now_x, str(each_runqueue[busiest]), runqueue_heat(each_runqueue[busiest].wait, self.color_theme)[1], max_x)
+            now_x = self._insstr(y, now_x, " cpu %d" % (busiest + 1), self.color_theme.LABEL, max_x)
+
+        now_x = self._insstr(y, now_x, ", Slices ", self.color_theme.LABEL, max_x)
+        now_x = self._insstr(y, now_x, "%s/s" % self.resource.runqueue.sliceRate, self.color_theme.RATE, max_x)
+
+#--------------------
+# SchedulerTextLine
+#--------------------
+
+
+class SchedulerTextLine(InfoTextLine):
+
+    """scheduler activity from /proc/stat.
+    example:
+        Ctxsw 12.3k/s, Intr 4.5k/s, Forks 3.0/s, Running 2, Blocked 0
+    """
+
+    def draw(self, y, x, width):
+        scheduler = self.resource.scheduler
+        max_x = x + width
+
+        now_x = x
+        for i, (label, rate) in enumerate((("Ctxsw ", scheduler.ctxtRate), ("Intr ", scheduler.intrRate), ("Forks ", scheduler.forkRate))):
+            now_x = self._insstr(y, now_x, (", " if i else "") + label, self.color_theme.LABEL, max_x)
+            now_x = self._insstr(y, now_x, "%s/s" % rate, self.color_theme.RATE, max_x)
+
+        now_x = self._insstr(y, now_x, ", Running ", self.color_theme.LABEL, max_x)
+        now_x = self._insstr(y, now_x, str(scheduler.running), self.color_theme.PROCS, max_x)
+        now_x = self._insstr(y, now_x, ", Blocked ", self.color_theme.LABEL, max_x)
+        now_x = self._insstr(y, now_x, str(scheduler.blocked), self.color_theme.ALERT if scheduler.blocked else self.color_theme.PROCS, max_x)
+
+#--------------------
+# PagingTextLine
+#--------------------
+
+
+class PagingTextLine(InfoTextLine):
+
+    """paging and reclaim activity from /proc/vmstat. scan and steal are kswapd/direct.
+    example:
+        Swap in 0/s out 12/s, Majflt 3.0/s, Scan 1.2k/0/s, Steal 1.1k/0/s, OOM kills 0
+    """
+
+    def draw(self, y, x, width):
+        paging = self.resource.paging
+        max_x = x + width
+
+        now_x = x
+        for label, rate in (("Swap in ", paging.swapInRate), (" out ", paging.swapOutRate), (", Majflt ", paging.majfaultRate)):
+            now_x = self._insstr(y, now_x, label, self.color_theme.LABEL, max_x)
+            now_x = self._insstr(y, now_x, "%s/s" % rate, self.color_theme.RATE, max_x)
+
+        for label, kswapd, direct in ((", Scan ", paging.scanKswapdRate, paging.scanDirectRate), (", Steal ", paging.stealKswapdRate, paging.stealDirectRate)):
+            now_x = self._insstr(y, now_x, label, self.color_theme.LABEL, max_x)
+            now_x = self._insstr(y, now_x, "%s/%s/s" % (kswapd, direct), self.color_theme.RATE, max_x)
+
+        now_x = self._insstr(y, now_x, ", OOM kills ", self.color_theme.LABEL, max_x)
+        now_x = self._insstr(y, now_x, str(paging.oomKills), self.color_theme.ALERT if paging.oomKills else self.color_theme.PROCS, max_x)
+
+#--------------------
+# TcpTextLine
+#--------------------
+
+
+class TcpTextLine(InfoTextLine):
+
+    """TCP health. opens are active/passive.
+    example:
+        TCP Retrans 12/s 0.3%, Opens 5.0/3.0/s, Listen overflows 0.0/s drops 0.0/s, Estab 20, Inuse 24, Orphan 0, TW 130
+    """
+
+    def draw(self, y, x, width):
+        tcp = self.resource.tcp
+        max_x = x + width
+
+        now_x = self._insstr(y, x, "TCP Retrans ", self.color_theme.LABEL, max_x)
+        now_x = self._insstr(y, now_x, str(tcp), self.color_theme.RATE, max_x)
+        now_x = self._insstr(y, now_x, ", Opens ", self.color_theme.LABEL, max_x)
+        now_x = self._insstr(y, now_x, "%s/%s/s" % (tcp.activeOpenRate, tcp.passiveOpenRate), self.color_theme.RATE, max_x)
+
+        for label, rate in ((", Listen overflows ", tcp.listenOverflowRate), (" drops ", tcp.listenDropRate)):
+            now_x = self._insstr(y, now_x, label, self.color_theme.LABEL, max_x)
+            now_x = self._insstr(y, now_x, "%s/s" % rate, self.color_theme.ALERT if rate > 0 else self.color_theme.RATE, max_x)
+
+        for label, count in ((", Estab ", tcp.established), (", Inuse ", tcp.inuse), (", Orphan ", tcp.orphan), (", TW ", tcp.timewait)):
+            now_x = self._insstr(y, now_x, label, self.color_theme.LABEL, max_x)
+            now_x = self._insstr(y, now_x, str(count), self.color_theme.PROCS, max_x)
+
+#--------------------
+# FilesystemHorizontalLineGauge
+#--------------------
+
+
+class FilesystemHorizontalLineGauge(HorizontalLineGauge):
+
+    """example:
+        FS [|||||||||      /home 120000M/500000M 24% i3%]
+    """
+
+    def _label_attr(self):
+        return self.color_theme.STALE if self.resource.stale else HorizontalLineGauge._label_attr(self)
+
+    def _draw_resource(self, y, x, width, start_x, resource_width):
+        used_n = int(round(self.resource.percent * resource_width))
+        self.addstr(y, start_x, self.GAUGE * used_n, self.color_theme.FS_GAUGE_USED)
+        self.addstr(y, start_x + used_n, self.GAUGE_BLANK * (resource_width - used_n))
+
+    def _get_info_str(self):
+        return str(self.resource) + (" stale" if self.resource.stale else "")
+
+#--------------------
+# FilesystemGauges
+#--------------------
+
+
+class FilesystemGauges(ViewBase):
+
+    """gauges of Filesystem.MOUNTPOINTS. HorizontalDefaultLayout draws them under memory gauges."""
+
+    def __init__(self, scr, color_theme, resource):
+        ViewBase.__init__(self, scr, color_theme, resource)
+        self.gauges = [FilesystemHorizontalLineGauge(scr, color_theme, "FS", fs) for fs in resource.filesystems]
+
+    @classmethod
+    def height(cls):
+        # mountpoints are read again by core.set_root.
+        return len(core.Filesystem.MOUNTPOINTS)
+
+    def draw(self, y, x, width):
+        for i, gauge in enumerate(self.gauges):
+            gauge.draw(y + i, x, width)
+
+#--------------------
+# InterruptsTextLines
+#--------------------
+
+
+class InterruptsTextLines(InfoTextLine):
+
+    """hottest IRQ sources and softirq rates. numbers of CPU are same as labels of CPU gauges.
+    example:
+        IRQ 45 eth0-rx-0 12.3k/s 90% on 4, 46 eth0-tx-0 3.1k/s 100% on 2
+        Softirq NET_RX 120k/s 80.0k/s on 6, TIMER 4.0k/s 250 on 1
+    """
+
+    HEIGHT = 2
+
+    def draw(self, y, x, width):
+        interrupts = self.resource.interrupts
+        max_x = x + width
+
+        now_x = self._insstr(y, x, "IRQ ", self.color_theme.LABEL, max_x)
+        for i, (name, description, rate, hottest, share) in enumerate(interrupts.top_irqs):
+            now_x = self._insstr(y, now_x, (", " if i else "") + "%s %s " % (name, description), self.color_theme.LABEL, max_x)
+            now_x = self._insstr(y, now_x, "%s/s" % rate, self.color_theme.RATE, max_x)
+            now_x = self._insstr(y, now_x, " %s on %d" % (share, hottest + 1), self.color_theme.LABEL, max_x)
+
+        now_x = self._insstr(y + 1, x, "Softirq ", self.color_theme.LABEL, max_x)
+        for i, (name, rate, hottest, hottest_rate) in enumerate(interrupts.softirqs):
+            now_x = self._insstr(y + 1, now_x, (", " if i else "") + name + " ", self.color_theme.LABEL, max_x)
+            now_x = self._insstr(y + 1, now_x, "%s/s" % rate, self.color_theme.RATE, max_x)
+            now_x = self._insstr(y + 1, now_x, " %s/s on %d" % (hottest_rate, hottest + 1), self.color_theme.LABEL, max_x)
+
+#--------------------
+# PRESSURE_LABELS
+#--------------------
+
+# (label, kind) of PSI gauges. "s" means stall.
+PRESSURE_LABELS = (("CPs", "cpu"), ("MEs", "memory"), ("IOs", "io"))
+
+#--------------------
+# TEXT_LINES
+#--------------------
+
+# text lines which can be added by --show option.
+TEXT_LINES = {
+    "stats": StatsTextLine,
+    "irq": InterruptsTextLines,
+    "fs": FilesystemGauges,
+    "sched": SchedulerTextLine,
+    "paging": PagingTextLine,
+    "tcp": TcpTextLine,
+}
+
 
 #=======================================
 # Layout
@@ -384,16 +979,63 @@ class Layout(object):
     WIDTH = None
     HEIGHT = None
 
-    def __init__(self, scr, color_theme, system_status):
+    # if True, text lines of --show option are drawn under the layout.
+    TEXT_LINES = False
+
+    # (alert metric name, attribute name of view or list of views)
+    ALERT_VIEWS = (("cpu", "cpu"), ("core", "each_cpu"), ("mem", "memory"), ("swap", "swap"))
+
+    def __init__(self, scr, color_theme, system_status, show=(), alerts=None):
         self.scr = scr
         self.color_theme = color_theme
         self.system_status = system_status
+        self.show = show
+        self.alerts = alerts
+        self.stack_views = []
+        self.text_lines = []
+        self.interval_line = IntervalTextLine(scr, color_theme, system_status)
+
+        if self.TEXT_LINES:
+            self.text_lines = [TEXT_LINES[name](scr, color_theme, system_status) for name in show if name in TEXT_LINES]
 
         self._init()
 
+        if alerts:
+            self._watch_alerts(alerts)
+
+    def _watch_alerts(self, alerts):
+        for metric, name in self.ALERT_VIEWS:
+            views = getattr(self, name, [])
+            for view in views if isinstance(views, list) else [views]:
+                view.alert = (alerts, metric)
+
+    @classmethod
+    def size(cls, show=()):
+        """return (width, height) of layout. None means flexible."""
+        width, height = cls._size()
+        if height is not None and cls.TEXT_LINES:
+            height += sum(TEXT_LINES[name].height() for name in show if name in TEXT_LINES)
+
+        return width, height
+
+    @classmethod
+    def _size(cls):
+        """return (width, height) without text lines. it is computed when it is called, so core.set_root is reflected."""
+        return cls.WIDTH, cls.HEIGHT
+
     def _init(self):
         pass
 
+    def zoom(self, step):
+        for stack_view in self.stack_views:
+            stack_view.zoom(step)
+
+    def follow(self, layout):
+        """take over zoom of layout which is replaced by this."""
+        tiers = [stack_view.tier for stack_view in layout.stack_views]
+        if tiers:
+            self.zoom(max(tiers))
+
     def draw(self):
         height, width = self.scr.getmaxyx()
         self._draw(width, height)
@@ -401,6 +1043,22 @@ class Layout(object):
     def _draw(self, width, height):
         pass
 
+    def _text_lines_height(self):
+        return sum(text_line.height() for text_line in self.text_lines)
+
+    def _draw_interval(self, width, height):
+        """draw effective interval at the bottom while it is adapted. return height left for the layout."""
+        if self.system_status.interval is None:
+            return height
+
+        self.interval_line.draw(height - 1, 0, width)
+        return height - 1
+
+    def _draw_text_lines(self, y, width):
+        for text_line in self.text_lines:
+            text_line.draw(y, 0, width)
+            y += text_line.height()
+
 #--------------------
 # HorizontalMinimalLayout
 #--------------------
@@ -410,6 +1068,7 @@ class HorizontalMinimalLayout(Layout):
 
     WIDTH = None
     HEIGHT = 3
+    TEXT_LINES = True
 
     def _init(self):
         self.cpu = CPUHorizontalLineGauge(self.scr, self.color_theme, "CPU", self.system_status.cpu)
@@ -420,6 +1079,7 @@ class HorizontalMinimalLayout(Layout):
         self.cpu.draw(0, 0, width)
         self.memory.draw(1, 0, width)
         self.textline.draw(2, 0, width)
+        self._draw_text_lines(3, width)
 
 #--------------------
 # HorizontalDefaultLayout
@@ -429,15 +1089,31 @@ class HorizontalMinimalLayout(Layout):
 class HorizontalDefaultLayout(Layout):
 
     WIDTH = None
-    HEIGHT = 4 + int((1 + core.CPU.NUM_CPUS) / 2) - int(not bool(core.CPU.NUM_CPUS - 1)) # int(not bool(core.CPU.NUM_CPUS - 1)) means 1 if NUM_CPUS == 1 else 0
+    HEIGHT = None
+    TEXT_LINES = True
+
+    @classmethod
+    def _size(cls):
+        height = 4 + int((1 + core.CPU.NUM_CPUS) / 2) - int(not bool(core.CPU.NUM_CPUS - 1)) # int(not bool(core.CPU.NUM_CPUS - 1)) means 1 if NUM_CPUS == 1 else 0
+        height += 3 if core.PressureSet.AVAILABLE else 0
+        height += CPUTimesTextLine.HEIGHT
+        height += RunQueueHeatRow.HEIGHT if core.RunQueue.AVAILABLE else 0
+        return cls.WIDTH, height
 
     def _init(self):
         self.cpu = CPUHorizontalLineGauge(self.scr, self.color_theme, "CPU", self.system_status.cpu)
         self.each_cpu = [CPUHorizontalLineGauge(self.scr, self.color_theme, str(i + 1), cpu) for i, cpu in enumerate(self.system_status.each_cpu)] if core.CPU.NUM_CPUS > 1 else []
+        self.runqueue = [RunQueueHeatRow(self.scr, self.color_theme, self.system_status)] if core.RunQueue.AVAILABLE else []
+        self.cpu_times = CPUTimesTextLine(self.scr, self.color_theme, self.system_status)
         self.memory = MemoryHorizontalLineGauge(self.scr, self.color_theme, "MEM", self.system_status.memory)
         self.swap = MemoryHorizontalLineGauge(self.scr, self.color_theme, "SWP", self.system_status.swap)
+        self.pressures = [PressureHorizontalLineGauge(self.scr, self.color_theme, label, getattr(self.system_status.pressure, kind)) for label, kind in PRESSURE_LABELS] if core.PressureSet.AVAILABLE else []
         self.textline = InfoTextLine(self.scr, self.color_theme, self.system_status)
 
+        # filesystem gauges are drawn next to memory gauges instead of under text line.
+        self.filesystems = [text_line for text_line in self.text_lines if isinstance(text_line, FilesystemGauges)]
+        self.text_lines = [text_line for text_line in self.text_lines if text_line not in self.filesystems]
+
     def _draw(self, width, height):
         center = int(width / 2)
 
@@ -449,9 +1125,27 @@ class HorizontalDefaultLayout(Layout):
             cpu.draw(y, x, w)
 
         y = int(len(self.each_cpu) / 2) + 1
+        for runqueue in self.runqueue:
+            runqueue.draw(y, 0, width)
+            y += runqueue.HEIGHT
+
+        self.cpu_times.draw(y, 0, width)
+
+        y += self.cpu_times.HEIGHT
         self.memory.draw(y, 0, width)
         self.swap.draw(y + 1, 0, width)
-        self.textline.draw(y + 2, 0, width)
+
+        y += 2
+        for filesystems in self.filesystems:
+            filesystems.draw(y, 0, width)
+            y += filesystems.height()
+
+        for i, pressure in enumerate(self.pressures):
+            pressure.draw(y + i, 0, width)
+
+        y += len(self.pressures)
+        self.textline.draw(y, 0, width)
+        self._draw_text_lines(y + 1, width)
 
 
 #--------------------
@@ -468,6 +1162,8 @@ class VerticalMinimalLayout(Layout):
         self.memory = MemoryVerticalLineGauge(self.scr, self.color_theme, "MEM", self.system_status.memory)
 
     def _draw(self, width, height):
+        height = self._draw_interval(width, height)
+
         self.cpu.draw(0, 0, height)
         self.memory.draw(0, self.cpu.WIDTH, height)
 
@@ -478,16 +1174,27 @@ class VerticalMinimalLayout(Layout):
 
 class VerticalDefaultLayout(Layout):
 
-    WIDTH = 9 + 3 * (int((1 + core.CPU.NUM_CPUS) / 2) - int(not bool(core.CPU.NUM_CPUS - 1))) # int(not bool(core.CPU.NUM_CPUS - 1)) means 1 if NUM_CPUS == 1 else 0
+    WIDTH = None
     HEIGHT = None
 
+    @classmethod
+    def _size(cls):
+        width = 9 + 3 * (int((1 + core.CPU.NUM_CPUS) / 2) - int(not bool(core.CPU.NUM_CPUS - 1))) # int(not bool(core.CPU.NUM_CPUS - 1)) means 1 if NUM_CPUS == 1 else 0
+        width += 9 if core.PressureSet.AVAILABLE else 0
+        width += 3 if core.RunQueue.AVAILABLE else 0
+        return width, cls.HEIGHT
+
     def _init(self):
         self.cpu = CPUVerticalLineGauge(self.scr, self.color_theme, "CPU", self.system_status.cpu)
         self.each_cpu = [CPUVerticalLineGauge(self.scr, self.color_theme, str(i + 1), cpu) for i, cpu in enumerate(self.system_status.each_cpu)] if core.CPU.NUM_CPUS > 1 else []
+        self.runqueue = [RunQueueVerticalLineGauge(self.scr, self.color_theme, "RQ", self.system_status.runqueue)] if core.RunQueue.AVAILABLE else []
         self.memory = MemoryVerticalLineGauge(self.scr, self.color_theme, "MEM", self.system_status.memory)
         self.swap = MemoryVerticalLineGauge(self.scr, self.color_theme, "SWP", self.system_status.swap)
+        self.pressures = [PressureVerticalLineGauge(self.scr, self.color_theme, label, getattr(self.system_status.pressure, kind)) for label, kind in PRESSURE_LABELS] if core.PressureSet.AVAILABLE else []
 
     def _draw(self, width, height):
+        height = self._draw_interval(width, height)
+
         gauge_w = self.cpu.WIDTH
         center = int(height / 2)
 
@@ -499,9 +1206,17 @@ class VerticalDefaultLayout(Layout):
             cpu.draw(y, x, h)
 
         x = int((len(self.each_cpu) + 1) / 2 + 1) * gauge_w
+        for runqueue in self.runqueue:
+            runqueue.draw(0, x, height)
+            x += gauge_w
+
         self.memory.draw(0, x, height)
         self.swap.draw(0, x + gauge_w, height)
 
+        x += gauge_w * 2
+        for i, pressure in enumerate(self.pressures):
+            pressure.draw(0, x + gauge_w * i, height)
+
 #--------------------
 # HorizontalStackLayout
 #--------------------
@@ -511,17 +1226,29 @@ class HorizontalStackLayout(Layout):
 
     WIDTH = None
     HEIGHT = 11
+    TEXT_LINES = True
 
     def _init(self):
-        self.cpu = CPUHorizontalStackView(self.scr, self.color_theme, "CPU", self.system_status.cpu)
-        self.memory = MemoryHorizontalStackView(self.scr, self.color_theme, "MEM", self.system_status.memory)
+        self.cpu = CPUHorizontalStackView(self.scr, self.color_theme, "CPU", self.system_status.cpu, self.system_status.history("cpu"))
+        self.memory = MemoryHorizontalStackView(self.scr, self.color_theme, "MEM", self.system_status.memory, self.system_status.history("memory"))
+        self.stack_views = [self.cpu, self.memory]
+        if core.PressureSet.AVAILABLE:
+            self.stack_views.append(PressureHorizontalStackView(self.scr, self.color_theme, "PSI", self.system_status.pressure, self.system_status.history("pressure")))
+        if "sched" in self.show:
+            self.stack_views.append(SchedulerHorizontalStackView(self.scr, self.color_theme, "SCH", self.system_status.scheduler, self.system_status.history("scheduler")))
+        if "paging" in self.show:
+            self.stack_views.append(PagingHorizontalStackView(self.scr, self.color_theme, "PAG", self.system_status.paging, self.system_status.history("paging")))
         self.textline = InfoTextLine(self.scr, self.color_theme, self.system_status)
 
     def _draw(self, width, height):
-        center = int(width / 2)
-        self.cpu.draw(0, 0, (center, height - 1))
-        self.memory.draw(0, center, (center, height - 1))
-        self.textline.draw(height - 1, 0, width)
+        stack_height = height - 1 - self._text_lines_height()
+        stack_width = int(width / len(self.stack_views))
+        for i, stack_view in enumerate(self.stack_views):
+            w = stack_width if i < len(self.stack_views) - 1 else width - stack_width * i
+            stack_view.draw(0, stack_width * i, (w, stack_height))
+
+        self.textline.draw(stack_height, 0, width)
+        self._draw_text_lines(stack_height + 1, width)
 
 #--------------------
 # VerticalStackLayout
@@ -534,10 +1261,20 @@ class VerticalStackLayout(Layout):
     HEIGHT = None
 
     def _init(self):
-        self.cpu = CPUHorizontalStackView(self.scr, self.color_theme, "CPU", self.system_status.cpu)
-        self.memory = MemoryHorizontalStackView(self.scr, self.color_theme, "MEM", self.system_status.memory)
+        self.cpu = CPUHorizontalStackView(self.scr, self.color_theme, "CPU", self.system_status.cpu, self.system_status.history("cpu"))
+        self.memory = MemoryHorizontalStackView(self.scr, self.color_theme, "MEM", self.system_status.memory, self.system_status.history("memory"))
+        self.stack_views = [self.cpu, self.memory]
+        if core.PressureSet.AVAILABLE:
+            self.stack_views.append(PressureHorizontalStackView(self.scr, self.color_theme, "PSI", self.system_status.pressure, self.system_status.history("pressure")))
+        if "sched" in self.show:
+            self.stack_views.append(SchedulerHorizontalStackView(self.scr, self.color_theme, "SCH", self.system_status.scheduler, self.system_status.history("scheduler")))
+        if "paging" in self.show:
+            self.stack_views.append(PagingHorizontalStackView(self.scr, self.color_theme, "PAG", self.system_status.paging, self.system_status.history("paging")))
 
     def _draw(self, width, height):
-        center = int(height / 2)
-        self.cpu.draw(0, 0, (width, center))
-        self.memory.draw(center, 0, (width, height - center))
+        height = self._draw_interval(width, height)
+
+        stack_height = int(height / len(self.stack_views))
+        for i, stack_view in enumerate(self.stack_views):
+            h = stack_height if i < len(self.stack_views) - 1 else height - stack_height * i
+            stack_view.draw(stack_height * i, 0, (width, h))